@@ -1,16 +1,105 @@
-from logging.config import dictConfig
-from typing import Type
+import functools
+from typing import TYPE_CHECKING, Optional, Type
 
-from flask import Flask
+if TYPE_CHECKING:
+    from logging.handlers import QueueListener
 
-from guidedtopic.config import Config, configure_logging
-from guidedtopic.extensions import init_app as init_extensions
+    from flask import Flask
 
+    from guidedtopic.config import Config
 
-def create_app(config_class: Type[Config] = Config) -> Flask:
-    """Application factory for the Guided Topic platform."""
+
+__all__ = ["create_app", "reset_app_state", "Config"]
+
+_LOGGING_CONFIGURED = False
+
+
+def __getattr__(name: str):
+    """Resolve heavier public names on first access (PEP 562)."""
+    if name == "Config":
+        from guidedtopic.config import Config
+
+        return Config
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def create_app(config_class: Optional[Type["Config"]] = None) -> "Flask":
+    """
+    Application factory for the Guided Topic platform.
+
+    Set GUIDEDTOPIC_CACHE_APP to reuse one app per config class instead of
+    rebuilding it on every call (useful for test suites and WSGI workers
+    that call the factory repeatedly).
+    """
+    from guidedtopic.config import Config, _env_bool
+
+    if config_class is None:
+        config_class = Config
+    if _env_bool("GUIDEDTOPIC_CACHE_APP", False):
+        return _cached_create_app(config_class)
+    return _build_app(config_class)
+
+
+@functools.lru_cache(maxsize=4)
+def _cached_create_app(config_class: Type["Config"]) -> "Flask":
+    """Build the app once per config class and hand back the same instance."""
+    return _build_app(config_class)
+
+
+def _ensure_logging() -> None:
+    """Apply the logging dictConfig once per process."""
+    global _LOGGING_CONFIGURED
+    if _LOGGING_CONFIGURED:
+        return
+
+    from logging.config import dictConfig
+
+    from guidedtopic.config import _env_bool, configure_logging
 
     dictConfig(configure_logging())
+    # Opt-in: Flask's "wsgi" handler writes to the request's wsgi.errors,
+    # which the listener thread can't see, so queued records go to stderr
+    if _env_bool("GUIDEDTOPIC_ASYNC_LOGGING", False):
+        _queue_root_handlers()
+    _LOGGING_CONFIGURED = True
+
+
+def _queue_root_handlers() -> Optional["QueueListener"]:
+    """
+    Move the root logger's handlers behind a queue drained by a background thread.
+
+    Request threads only enqueue records; the blocking stream writes happen
+    on the listener thread, which is flushed and stopped at interpreter exit.
+    The listener runs outside any request, so handlers writing to
+    ``wsgi_errors_stream`` fall back to ``sys.stderr``.
+    """
+    import atexit
+    import logging
+    import queue
+    from logging.handlers import QueueHandler, QueueListener
+
+    root = logging.getLogger()
+    handlers = list(root.handlers)
+    if not handlers:
+        return None
+
+    records: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    listener = QueueListener(records, *handlers, respect_handler_level=True)
+    for handler in handlers:
+        root.removeHandler(handler)
+    root.addHandler(QueueHandler(records))
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
+
+
+def _build_app(config_class: Type["Config"]) -> "Flask":
+    from flask import Flask
+
+    from guidedtopic.config import ensure_default_db_dir
+    from guidedtopic.extensions import init_app as init_extensions
+
+    _ensure_logging()
 
     app = Flask(
         __name__,
@@ -18,6 +107,7 @@ def create_app(config_class: Type[Config] = Config) -> Flask:
         static_folder="static",
     )
     app.config.from_object(config_class)
+    ensure_default_db_dir(app.config["SQLALCHEMY_DATABASE_URI"])
 
     init_extensions(app)
 
@@ -38,3 +128,20 @@ def create_app(config_class: Type[Config] = Config) -> Flask:
     app.register_blueprint(errors)
 
     return app
+
+
+def reset_app_state(app: "Flask") -> None:
+    """
+    Return a reused app to a clean state between tests.
+
+    Discards the scoped database session, recreates every table so each
+    test starts from an empty schema, and drops per-app query caches.
+    """
+    from guidedtopic.extensions import db
+    from guidedtopic.qna.routes import invalidate_video_choices
+
+    invalidate_video_choices(app)
+    with app.app_context():
+        db.session.remove()
+        db.drop_all()
+        db.create_all()
@@ -1,16 +1,44 @@
 import os
 import secrets
+import sys
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 
 BASE_DIR = Path(__file__).resolve().parent
 DEFAULT_DB_PATH = BASE_DIR.parent / "instance" / "guidedtopic.db"
-DEFAULT_DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+
+DEFAULT_UPLOAD_EXTENSIONS = frozenset({"mp4", "m4v", "mov"})
+
+# Snapshot of the process environment taken once at import time.
+_ENV: Dict[str, str] = dict(os.environ)
+
+
+def refresh_env() -> None:
+    """Re-snapshot os.environ (for tests that mutate the environment)."""
+    _ENV.clear()
+    _ENV.update(os.environ)
+
+
+def _env(name: str, default: Optional[str] = None) -> Optional[str]:
+    return _ENV.get(name, default)
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    """Intern a string config value so repeated lookups share one object."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _env_list(name: str) -> Tuple[str, ...]:
+    """Split a comma-separated variable into a tuple of stripped, interned items."""
+    raw = _env(name)
+    if not raw:
+        return ()
+    return tuple(sys.intern(item.strip()) for item in raw.split(",") if item.strip())
 
 
 def _env_bool(name: str, default: Union[str, bool] = "True") -> bool:
-    value = os.getenv(name, default)
+    value = _env(name, default)
     if isinstance(value, bool):
         return value
     return str(value).lower() in {"1", "true", "yes", "on"}
@@ -20,69 +48,89 @@ class Config:
     """Base configuration driven by environment variables."""
 
     SECRET_KEY = (
-        os.getenv("GUIDEDTOPIC_SECRET_KEY")
-        or os.getenv("SECRET_KEY")
+        _env("GUIDEDTOPIC_SECRET_KEY")
+        or _env("SECRET_KEY")
         or secrets.token_urlsafe(32)
     )
 
     SQLALCHEMY_DATABASE_URI = (
-        os.getenv("GUIDEDTOPIC_DATABASE_URI")
-        or os.getenv("DATABASE_URL")
+        _env("GUIDEDTOPIC_DATABASE_URI")
+        or _env("DATABASE_URL")
         or f"sqlite:///{DEFAULT_DB_PATH}"
     )
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
-    MAIL_SERVER = os.getenv("GUIDEDTOPIC_MAIL_SERVER", os.getenv("MAIL_SERVER", "smtp.googlemail.com"))
-    MAIL_PORT = int(os.getenv("GUIDEDTOPIC_MAIL_PORT", os.getenv("MAIL_PORT", 587)))
-    MAIL_USE_TLS = _env_bool("GUIDEDTOPIC_MAIL_USE_TLS", os.getenv("MAIL_USE_TLS", "True"))
-    MAIL_USERNAME = os.getenv("GUIDEDTOPIC_MAIL_USERNAME", os.getenv("MAIL_USERNAME"))
-    MAIL_PASSWORD = os.getenv("GUIDEDTOPIC_MAIL_PASSWORD", os.getenv("MAIL_PASSWORD"))
-    MAIL_DEFAULT_SENDER = os.getenv("GUIDEDTOPIC_MAIL_DEFAULT_SENDER", MAIL_USERNAME)
-
-    AWS_REGION = os.getenv("GUIDEDTOPIC_AWS_REGION", os.getenv("AWS_REGION"))
-    AWS_S3_BUCKET = (
-        os.getenv("GUIDEDTOPIC_S3_BUCKET")
-        or os.getenv("GUIDEDTOPIC_AWS_S3_BUCKET")
-        or os.getenv("AWS_S3_BUCKET")
+    # Connection pool sizing for server databases (ignored for SQLite)
+    DB_POOL_SIZE = int(_env("GUIDEDTOPIC_DB_POOL_SIZE", "10"))
+    DB_POOL_OVERFLOW = int(_env("GUIDEDTOPIC_DB_POOL_OVERFLOW", "20"))
+
+    # bcrypt work factor for new password hashes; existing hashes keep theirs
+    BCRYPT_LOG_ROUNDS = int(_env("GUIDEDTOPIC_BCRYPT_LOG_ROUNDS", "12"))
+
+    MAIL_SERVER = _intern(_env("GUIDEDTOPIC_MAIL_SERVER", _env("MAIL_SERVER", "smtp.googlemail.com")))
+    MAIL_PORT = int(_env("GUIDEDTOPIC_MAIL_PORT", _env("MAIL_PORT", "587")))
+    MAIL_USE_TLS = _env_bool("GUIDEDTOPIC_MAIL_USE_TLS", _env("MAIL_USE_TLS", "True"))
+    MAIL_USERNAME = _intern(_env("GUIDEDTOPIC_MAIL_USERNAME", _env("MAIL_USERNAME")))
+    MAIL_PASSWORD = _env("GUIDEDTOPIC_MAIL_PASSWORD", _env("MAIL_PASSWORD"))
+    MAIL_DEFAULT_SENDER = _env("GUIDEDTOPIC_MAIL_DEFAULT_SENDER", MAIL_USERNAME)
+
+    AWS_REGION = _intern(_env("GUIDEDTOPIC_AWS_REGION", _env("AWS_REGION")))
+    AWS_S3_BUCKET = _intern(
+        _env("GUIDEDTOPIC_S3_BUCKET")
+        or _env("GUIDEDTOPIC_AWS_S3_BUCKET")
+        or _env("AWS_S3_BUCKET")
     )
 
-    STREAMING_TEMPLATE = os.getenv("GUIDEDTOPIC_STREAMING_TEMPLATE")
+    # Parallel 8 MiB parts per multipart S3 upload
+    S3_UPLOAD_CONCURRENCY = int(_env("GUIDEDTOPIC_S3_UPLOAD_CONCURRENCY", "8"))
+
+    # Let browsers upload videos straight to S3 with a presigned POST
+    # (the bucket needs a CORS rule allowing POST from this site)
+    S3_DIRECT_UPLOAD = _env_bool("GUIDEDTOPIC_S3_DIRECT_UPLOAD", False)
 
-    SUPPORT_RECIPIENTS = [
-        addr.strip()
-        for addr in os.getenv("GUIDEDTOPIC_SUPPORT_RECIPIENTS", "").split(",")
-        if addr.strip()
-    ]
+    STREAMING_TEMPLATE = _env("GUIDEDTOPIC_STREAMING_TEMPLATE")
 
-    WELCOME_VIDEO_URL = os.getenv("GUIDEDTOPIC_WELCOME_VIDEO_URL")
+    SUPPORT_RECIPIENTS = _env_list("GUIDEDTOPIC_SUPPORT_RECIPIENTS")
+
+    WELCOME_VIDEO_URL = _env("GUIDEDTOPIC_WELCOME_VIDEO_URL")
 
     MAX_CONTENT_LENGTH = int(
-        os.getenv("GUIDEDTOPIC_MAX_CONTENT_LENGTH", str(500 * 1024 * 1024))
+        _env("GUIDEDTOPIC_MAX_CONTENT_LENGTH", str(500 * 1024 * 1024))
+    )
+    UPLOAD_ALLOWED_EXTENSIONS = (
+        frozenset(ext.lower() for ext in _env_list("GUIDEDTOPIC_ALLOWED_EXTENSIONS"))
+        or DEFAULT_UPLOAD_EXTENSIONS
     )
-    UPLOAD_ALLOWED_EXTENSIONS = {
-        ext.strip().lower()
-        for ext in os.getenv("GUIDEDTOPIC_ALLOWED_EXTENSIONS", "mp4,m4v,mov").split(",")
-        if ext.strip()
-    }
 
     # Google OAuth (works for both consumer and Google Workspace)
-    GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID")
-    GOOGLE_CLIENT_SECRET = os.getenv("GOOGLE_CLIENT_SECRET")
+    GOOGLE_CLIENT_ID = _env("GOOGLE_CLIENT_ID")
+    GOOGLE_CLIENT_SECRET = _env("GOOGLE_CLIENT_SECRET")
     GOOGLE_DISCOVERY_URL = "https://accounts.google.com/.well-known/openid-configuration"
 
     # Microsoft Entra ID (Azure AD) OAuth/OIDC
-    AZURE_AD_TENANT_ID = os.getenv("AZURE_AD_TENANT_ID", "common")  # "common" for multi-tenant
-    AZURE_AD_CLIENT_ID = os.getenv("AZURE_AD_CLIENT_ID")
-    AZURE_AD_CLIENT_SECRET = os.getenv("AZURE_AD_CLIENT_SECRET")
+    AZURE_AD_TENANT_ID = _env("AZURE_AD_TENANT_ID", "common")  # "common" for multi-tenant
+    AZURE_AD_CLIENT_ID = _env("AZURE_AD_CLIENT_ID")
+    AZURE_AD_CLIENT_SECRET = _env("AZURE_AD_CLIENT_SECRET")
     
+    # Seconds before a cached OIDC discovery document is refreshed
+    OIDC_CACHE_MAX_AGE = int(_env("GUIDEDTOPIC_OIDC_CACHE_MAX_AGE", str(24 * 60 * 60)))
+
     # OAuth redirect base URL
-    OAUTH_REDIRECT_BASE = os.getenv("OAUTH_REDIRECT_BASE", "http://localhost:5000")
+    OAUTH_REDIRECT_BASE = _env("OAUTH_REDIRECT_BASE", "http://localhost:5000")
+
+
+def ensure_default_db_dir(database_uri: str) -> None:
+    """Create the instance directory when the app uses the default SQLite file."""
+    if database_uri != f"sqlite:///{DEFAULT_DB_PATH}":
+        return
+    if not DEFAULT_DB_PATH.parent.exists():
+        DEFAULT_DB_PATH.parent.mkdir(parents=True, exist_ok=True)
 
 
 def configure_logging() -> Dict[str, Any]:
     """Return a dictConfig structure based on environment log-level overrides."""
 
-    level = os.getenv("GUIDEDTOPIC_LOG_LEVEL", os.getenv("LOG_LEVEL", "INFO")).upper()
+    level = _env("GUIDEDTOPIC_LOG_LEVEL", _env("LOG_LEVEL", "INFO")).upper()
     return {
         "version": 1,
         "formatters": {
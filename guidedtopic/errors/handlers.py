@@ -2,17 +2,19 @@ from flask import Blueprint, render_template
 
 errors = Blueprint('errors', __name__)
 
-@errors.app_errorhandler(404)
-def error_404(error):
-    """Render the custom 404 page when a route is not found."""
-    return render_template('404.html'), 404
+# Status code -> template rendered for it
+_ERROR_TEMPLATES = {
+    403: '403.html',
+    404: '404.html',
+    500: '500.html',
+}
 
-@errors.app_errorhandler(403)
-def error_403(error):
-    """Render the 403 page when access is forbidden."""
-    return render_template('403.html'), 403
 
-@errors.app_errorhandler(500)
-def error_500(error):
-    """Render the fallback error page for unhandled exceptions."""
-    return render_template('500.html'), 500
+def render_error(error):
+    """Render the custom error page matching the error's status code."""
+    code = getattr(error, 'code', None) or 500
+    return render_template(_ERROR_TEMPLATES.get(code, '500.html')), code
+
+
+for _code in _ERROR_TEMPLATES:
+    errors.app_errorhandler(_code)(render_error)
@@ -9,12 +9,15 @@ This module initializes all Flask extensions used by the application:
 - Migrate: Database migrations
 - OAuth: OAuth 2.0/OIDC authentication (Google, Microsoft Entra ID)
 """
+from flask import current_app
 from flask_bcrypt import Bcrypt
 from flask_login import LoginManager
 from flask_mail import Mail
 from flask_migrate import Migrate
 from flask_sqlalchemy import SQLAlchemy
-from authlib.integrations.flask_client import OAuth
+from sqlalchemy.engine import make_url
+
+from guidedtopic.oidc_cache import CachedMetadataOAuth
 
 
 # ============================================================================
@@ -27,7 +30,10 @@ bcrypt = Bcrypt()
 mail = Mail()
 login_manager = LoginManager()
 migrate = Migrate()
-oauth = OAuth()
+oauth = CachedMetadataOAuth()  # Caches OIDC discovery documents on disk
+
+# Names of OAuth providers already registered with `oauth`
+_oauth_registered = set()
 
 
 # ============================================================================
@@ -43,8 +49,27 @@ def init_app(app):
     
     This function is called during app factory creation to bind all
     extensions to the Flask app. OAuth providers are registered
-    conditionally based on configuration.
+    later, on first use, by ensure_provider().
     """
+    # Pool settings for server databases; SQLite keeps SQLAlchemy's defaults
+    database_uri = app.config.get('SQLALCHEMY_DATABASE_URI', '')
+    if not database_uri.startswith('sqlite:'):
+        app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', {
+            'pool_pre_ping': True,  # Detect connections dropped by the server
+            'pool_recycle': 1800,  # Replace connections before idle timeouts
+            'pool_size': app.config.get('DB_POOL_SIZE', 10),
+            'max_overflow': app.config.get('DB_POOL_OVERFLOW', 20),
+        })
+    
+    # psycopg2 already pages executemany() INSERTs through execute_values;
+    # also page UPDATE/DELETE executemany() through execute_batch. The cost:
+    # psycopg2 then can't report per-row counts for those statements, so
+    # SQLAlchemy stops checking that each UPDATE/DELETE matched one row
+    if make_url(database_uri).drivername in ('postgresql', 'postgresql+psycopg2'):
+        engine_options = app.config['SQLALCHEMY_ENGINE_OPTIONS']
+        engine_options.setdefault('executemany_mode', 'values_plus_batch')
+        engine_options.setdefault('executemany_batch_page_size', 500)
+    
     # Initialize core extensions
     db.init_app(app)
     bcrypt.init_app(app)
@@ -56,17 +81,51 @@ def init_app(app):
     # OAuth Provider Registration
     # ========================================================================
     
-    # Initialize OAuth client
+    # Initialize OAuth client (providers are registered lazily)
     oauth.init_app(app)
     
-    # Register Google OAuth provider (if configured)
+    # ========================================================================
+    # Flask-Login Configuration
+    # ========================================================================
+    
+    # Set the login view for unauthorized access attempts
+    login_manager.login_view = "users.login"
+    login_manager.login_message_category = "info"
+
+
+# ============================================================================
+# Lazy OAuth Provider Registration
+# ============================================================================
+
+def ensure_provider(name):
+    """
+    Register an OAuth provider on first use and return its client.
+    
+    Args:
+        name: OAuth provider name ('google' or 'azure')
+    
+    Returns:
+        The authlib client for the provider, or None if the provider is
+        unknown or has no credentials configured.
+    
+    Registration is deferred until a user actually starts an OAuth flow,
+    so building the app (tests, CLI commands) never pays for it.
+    """
+    if name in _oauth_registered:
+        return oauth.create_client(name)
+    
+    config = current_app.config
+    
+    # Google OAuth provider
     # Works with both consumer Google accounts and Google Workspace
-    if app.config.get('GOOGLE_CLIENT_ID') and app.config.get('GOOGLE_CLIENT_SECRET'):
+    if name == 'google':
+        if not (config.get('GOOGLE_CLIENT_ID') and config.get('GOOGLE_CLIENT_SECRET')):
+            return None
         oauth.register(
             name='google',
-            client_id=app.config['GOOGLE_CLIENT_ID'],
-            client_secret=app.config['GOOGLE_CLIENT_SECRET'],
-            server_metadata_url=app.config.get(
+            client_id=config['GOOGLE_CLIENT_ID'],
+            client_secret=config['GOOGLE_CLIENT_SECRET'],
+            server_metadata_url=config.get(
                 'GOOGLE_DISCOVERY_URL',
                 'https://accounts.google.com/.well-known/openid-configuration'
             ),
@@ -75,32 +134,32 @@ def init_app(app):
             }
         )
     
-    # Register Microsoft Entra ID (Azure AD) provider (if configured)
+    # Microsoft Entra ID (Azure AD) provider
     # Supports both single-tenant and multi-tenant configurations
-    if app.config.get('AZURE_AD_CLIENT_ID') and app.config.get('AZURE_AD_CLIENT_SECRET'):
-        tenant_id = app.config.get('AZURE_AD_TENANT_ID', 'common')
+    elif name == 'azure':
+        if not (config.get('AZURE_AD_CLIENT_ID') and config.get('AZURE_AD_CLIENT_SECRET')):
+            return None
+        tenant_id = config.get('AZURE_AD_TENANT_ID', 'common')
         
         # Build discovery URL based on tenant configuration
         # 'common' = multi-tenant, specific ID = single-tenant
-        discovery_url = app.config.get(
+        discovery_url = config.get(
             'AZURE_AD_DISCOVERY_URL',
             f"https://login.microsoftonline.com/{tenant_id}/v2.0/.well-known/openid-configuration"
         )
         
         oauth.register(
             name='azure',
-            client_id=app.config['AZURE_AD_CLIENT_ID'],
-            client_secret=app.config['AZURE_AD_CLIENT_SECRET'],
+            client_id=config['AZURE_AD_CLIENT_ID'],
+            client_secret=config['AZURE_AD_CLIENT_SECRET'],
             server_metadata_url=discovery_url,
             client_kwargs={
                 'scope': 'openid email profile User.Read'  # Request access to user profile and email
             }
         )
     
-    # ========================================================================
-    # Flask-Login Configuration
-    # ========================================================================
+    else:
+        return None
     
-    # Set the login view for unauthorized access attempts
-    login_manager.login_view = "users.login"
-    login_manager.login_message_category = "info"
+    _oauth_registered.add(name)
+    return oauth.create_client(name)
@@ -1,10 +1,20 @@
-from flask import Blueprint, jsonify, render_template, request
+import json
+
+from flask import Blueprint, abort, jsonify, render_template, request
+from sqlalchemy import insert
 
 from guidedtopic.extensions import db
 from guidedtopic.models import Feedback, Post
 
 main = Blueprint('main', __name__)
 
+# Largest feedback request body accepted, in bytes
+FEEDBACK_MAX_BYTES = 16 * 1024
+
+# Longest values stored per field; the Feedback columns are unbounded Text
+FEEDBACK_TYPE_MAX_LENGTH = 32
+FEEDBACK_CONTENT_MAX_LENGTH = 5000
+
 
 @main.route("/")
 @main.route("/about")
@@ -23,13 +33,42 @@ def home():
 
 @main.route("/feedback", methods=["POST"])
 def feedback():
-    """Persist quick feedback submissions from the sidebar widget."""
-    if request.method == "POST":
-        data = request.get_json()
-        fbt = data[0]['selectedType']
-        cntnt = data[1]['content']
-        fb = Feedback(feedback_type=fbt, content=cntnt)
-        db.session.add(fb)
-        db.session.commit()
-    resp = jsonify(success=True)
-    return resp
+    """
+    Persist quick feedback submissions from the sidebar widget.
+    
+    Expects the widget's payload: [{"selectedType": ...}, {"content": ...}]
+    with non-empty string values. Non-JSON requests are rejected with 415,
+    malformed bodies with 400 and oversized ones with 413.
+    """
+    # Require a JSON content type: cross-site forms can only send
+    # form-encoded or text/plain bodies without a CORS preflight
+    if not request.is_json:
+        abort(415)
+    
+    # Reject a declared oversize body without reading it; bodies without a
+    # Content-Length are read up to the cap and rejected if they exceed it
+    if request.content_length is not None and request.content_length > FEEDBACK_MAX_BYTES:
+        abort(413)
+    body = request.stream.read(FEEDBACK_MAX_BYTES + 1)
+    if len(body) > FEEDBACK_MAX_BYTES:
+        abort(413)
+    
+    try:
+        data = json.loads(body)
+    except ValueError:
+        abort(400)
+    if not isinstance(data, list) or len(data) < 2 \
+            or not isinstance(data[0], dict) or not isinstance(data[1], dict):
+        abort(400)
+    
+    fbt = data[0].get('selectedType')
+    cntnt = data[1].get('content')
+    if not isinstance(fbt, str) or not isinstance(cntnt, str) or not fbt or not cntnt:
+        abort(400)
+    if len(fbt) > FEEDBACK_TYPE_MAX_LENGTH or len(cntnt) > FEEDBACK_CONTENT_MAX_LENGTH:
+        abort(400)
+    
+    # Single-row Core insert; no ORM unit-of-work needed
+    db.session.execute(insert(Feedback).values(feedback_type=fbt, content=cntnt))
+    db.session.commit()
+    return jsonify(success=True)
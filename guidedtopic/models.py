@@ -6,17 +6,36 @@ Defines SQLAlchemy models for:
 - Post: Announcements/blog posts by educators
 - Video: Instructional videos with metadata
 - Question: Branching questions that appear during video playback
+- QuestionAnswer: Answer choices of a question and their branch targets
 - Feedback: User feedback submissions
 """
+import functools
 from datetime import datetime
 
 from flask import current_app
 from flask_login import UserMixin
-from itsdangerous import URLSafeTimedSerializer
+from itsdangerous import BadData, URLSafeTimedSerializer
 
 from guidedtopic.extensions import db, login_manager
 
 
+# Longest password reset token accepted; real tokens are well under 200 chars
+RESET_TOKEN_MAX_LENGTH = 512
+
+# Display letters for answer positions 0-4
+ANSWER_LABELS = 'ABCDE'
+
+
+# ============================================================================
+# Token Serializer
+# ============================================================================
+
+@functools.lru_cache(maxsize=4)
+def _reset_serializer(secret_key):
+    """Return a shared password-reset serializer for the given secret key."""
+    return URLSafeTimedSerializer(secret_key)
+
+
 # ============================================================================
 # Flask-Login User Loader
 # ============================================================================
@@ -27,8 +46,9 @@ def load_user(user_id):
     Return the user instance for Flask-Login from the stored user id.
     
     This callback is required by Flask-Login to load users from the session.
+    Session.get() checks the session's identity map before querying.
     """
-    return User.query.get(int(user_id))
+    return db.session.get(User, int(user_id))
 
 
 # ============================================================================
@@ -64,12 +84,14 @@ class User(db.Model, UserMixin):
     # OAuth authentication fields
     oauth_provider = db.Column(db.String(50), nullable=True)  # 'google' or 'azure'
     oauth_id = db.Column(db.String(255), nullable=True)  # Provider's user ID
-    oauth_email = db.Column(db.String(120), nullable=True)  # Email from OAuth provider
+    oauth_email = db.Column(db.String(120), nullable=True, index=True)  # Email from OAuth provider
     oauth_tenant_id = db.Column(db.String(255), nullable=True)  # Azure AD tenant ID
     oauth_domain = db.Column(db.String(255), nullable=True)  # Google Workspace domain
     
     # Relationships
-    posts = db.relationship('Post', backref='author', lazy=True, cascade='all, delete-orphan')
+    # Post.author is joined-loaded: every page that lists posts renders the author
+    posts = db.relationship('Post', backref=db.backref('author', lazy='joined'),
+                            lazy=True, cascade='all, delete-orphan')
     video = db.relationship('Video', backref='author', lazy=True, cascade='all, delete-orphan')
     
     # Unique constraint: OAuth provider + OAuth ID must be unique
@@ -100,7 +122,7 @@ class User(db.Model, UserMixin):
             - Salt prevents token reuse for other purposes
             - Time-limited to prevent indefinite validity
         """
-        s = URLSafeTimedSerializer(current_app.config['SECRET_KEY'])
+        s = _reset_serializer(current_app.config['SECRET_KEY'])
         return s.dumps({'user_id': self.id}, salt='password-reset')
 
     @staticmethod
@@ -118,13 +140,16 @@ class User(db.Model, UserMixin):
             - Validates token signature
             - Checks token expiration (30 minutes)
             - Returns None for invalid/expired tokens
+            - Oversized tokens are rejected before the signature is checked
         """
-        s = URLSafeTimedSerializer(current_app.config['SECRET_KEY'])
+        if not token or len(token) > RESET_TOKEN_MAX_LENGTH:
+            return None
+        s = _reset_serializer(current_app.config['SECRET_KEY'])
         try:
             user_id = s.loads(token, salt='password-reset', max_age=1800)['user_id']
-        except:
+        except BadData:
             return None
-        return User.query.get(user_id)
+        return db.session.get(User, user_id)
 
     def __repr__(self):
         return "User({}, {}, {})".format(self.username, self.email, self.image_file)
@@ -146,9 +171,9 @@ class Post(db.Model):
     """
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(120), nullable=False)
-    date_posted = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    date_posted = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
     content = db.Column(db.Text, nullable=False)
-    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
 
     def __repr__(self):
         return "Post({}, {})".format(self.title, self.date_posted)
@@ -170,11 +195,16 @@ class Video(db.Model):
     description = db.Column(db.String(220))
     date_posted = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     video_file = db.Column(db.String(120), default="default.mp4")  # S3 URL or streaming URL
-    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
     duration = db.Column(db.Float, default=0.0)  # Video duration in seconds
     is_remedial = db.Column(db.Boolean, default=False)  # True if this is a remedial video
     total_views = db.Column(db.Integer, default=0)  # View counter
     
+    # Learner lists filter on is_remedial and page in id order
+    __table_args__ = (
+        db.Index('ix_video_is_remedial_id', 'is_remedial', 'id'),
+    )
+    
     # Relationships
     questions = db.relationship('Question', backref='associated_video', lazy=True, cascade='all, delete-orphan')
 
@@ -191,34 +221,80 @@ class Question(db.Model):
     redirect the learner to a different video (branching).
     
     Branching Logic:
-        - If targetvid is set to a video ID, learner is redirected to that video
-        - If targetvid is 0 or None, learner continues with current video
+        - If target_vid is set to a video ID, learner is redirected to that video
+        - If target_vid is 0 or None, learner continues with current video
         - This enables adaptive learning paths based on learner responses
     
     Relationships:
         - associated_video: Many-to-one with Video (question belongs to one video)
+        - answers: One-to-many with QuestionAnswer, ordered by position
     """
     id = db.Column(db.Integer, primary_key=True)
     content = db.Column(db.Text, nullable=False)  # Question text
     pose_time = db.Column(db.Integer)  # Time in seconds when question appears
     video_id = db.Column(db.Integer, db.ForeignKey('video.id'))
     
+    # Questions are always listed per video in pose_time order
+    __table_args__ = (
+        db.Index('ix_question_video_id_pose_time', 'video_id', 'pose_time'),
+    )
+    
     # Answer choices and their target videos (branching)
-    contentA = db.Column(db.Text)
-    targetvidA = db.Column(db.Integer)  # Video ID to redirect to if answer A is selected
-    contentB = db.Column(db.Text)
-    targetvidB = db.Column(db.Integer)
-    contentC = db.Column(db.Text)
-    targetvidC = db.Column(db.Integer)
-    contentD = db.Column(db.Text)
-    targetvidD = db.Column(db.Integer)
-    contentE = db.Column(db.Text)
-    targetvidE = db.Column(db.Integer)
+    answers = db.relationship('QuestionAnswer', backref='question', lazy='selectin',
+                              order_by='QuestionAnswer.position', cascade='all, delete-orphan')
+
+    def set_answers(self, choices):
+        """
+        Replace the answer choices from (content, target_vid) pairs in A-E order.
+        
+        Pairs with empty content are dropped. Answers that keep their
+        position are updated in place rather than deleted and re-inserted.
+        """
+        existing = {answer.position: answer for answer in self.answers}
+        answers = []
+        for position, (content, target_vid) in enumerate(choices):
+            if not content:
+                continue
+            answer = existing.get(position) or QuestionAnswer(position=position)
+            answer.content = content
+            answer.target_vid = target_vid
+            answers.append(answer)
+        self.answers = answers
 
     def __repr__(self):
         return "Question, id, and video are ({}, {}, {})".format(self.content, self.id, self.video_id)
 
 
+class QuestionAnswer(db.Model):
+    """
+    One answer choice of a Question and the video it branches to.
+    
+    Only answers that have content are stored, so a two-choice question
+    has two rows instead of five mostly-empty column pairs.
+    
+    Relationships:
+        - question: Many-to-one with Question (answer belongs to one question)
+    """
+    id = db.Column(db.Integer, primary_key=True)
+    question_id = db.Column(db.Integer, db.ForeignKey('question.id'), nullable=False)
+    position = db.Column(db.SmallInteger, nullable=False)  # 0-4, displayed as A-E
+    content = db.Column(db.Text)  # Answer text
+    target_vid = db.Column(db.Integer)  # Video ID to redirect to if this answer is selected
+    
+    # One answer per position; also serves as the index for question_id lookups
+    __table_args__ = (
+        db.UniqueConstraint('question_id', 'position', name='uq_question_answer_position'),
+    )
+    
+    @property
+    def label(self):
+        """Return the display letter (A-E) for this answer."""
+        return ANSWER_LABELS[self.position]
+
+    def __repr__(self):
+        return "QuestionAnswer({}, {}, {})".format(self.question_id, self.label, self.content)
+
+
 class Feedback(db.Model):
     """
     Stores qualitative feedback submitted through the site widget.
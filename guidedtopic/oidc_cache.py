@@ -0,0 +1,141 @@
+"""
+On-disk cache for OpenID Connect discovery documents.
+
+authlib fetches each provider's ``server_metadata_url`` the first time the
+provider is used, which puts a blocking HTTPS round trip on the login path.
+This module keeps a copy of every discovery document under the instance
+folder and serves it stale-while-revalidate:
+
+- Fresh copy on disk -> returned without touching the network
+- Stale copy on disk -> returned immediately, refreshed in a background thread
+- No copy on disk -> fetched synchronously and written to disk
+
+A failed refresh leaves the cached copy in place, so a provider outage
+does not break sign-in for users whose provider metadata is already known.
+
+The authlib clients built here also send every request through one shared
+connection pool, so token exchanges and userinfo calls reuse open TLS
+connections to the provider instead of handshaking on each callback.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+import requests
+from authlib.integrations.flask_client import FlaskOAuth2App, OAuth
+from authlib.integrations.requests_client import OAuth2Session
+from flask import current_app
+from requests.adapters import HTTPAdapter
+
+
+logger = logging.getLogger(__name__)
+
+# Timeout (seconds) for discovery document requests
+FETCH_TIMEOUT = 2
+
+
+# ============================================================================
+# Discovery Document Cache
+# ============================================================================
+
+def _fetch(url):
+    """Download and decode a discovery document."""
+    resp = requests.get(url, timeout=FETCH_TIMEOUT)
+    resp.raise_for_status()
+    return resp.json()
+
+
+def _write(path, metadata):
+    """Atomically write a discovery document to the cache file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix('.tmp')
+    tmp_path.write_text(json.dumps(metadata))
+    os.replace(tmp_path, path)
+
+
+def _refresh(url, path):
+    """Re-fetch a discovery document, keeping the stale copy on failure."""
+    try:
+        _write(path, _fetch(url))
+    except (requests.RequestException, ValueError, OSError):
+        logger.warning('Refreshing OIDC discovery document %s failed; keeping cached copy', url)
+
+
+def load_discovery_document(url, path, max_age):
+    """
+    Return the discovery document for ``url`` using the cache at ``path``.
+    
+    Args:
+        url: Provider's server_metadata_url
+        path: Cache file location (pathlib.Path)
+        max_age: Seconds after which the cached copy is refreshed
+    
+    Returns:
+        dict: Provider metadata
+    """
+    try:
+        age = time.time() - path.stat().st_mtime
+        metadata = json.loads(path.read_text())
+    except (OSError, ValueError):
+        metadata = None
+    
+    if metadata is None:
+        metadata = _fetch(url)
+        try:
+            _write(path, metadata)
+        except OSError:
+            logger.warning('Could not write OIDC discovery cache %s', path)
+        return metadata
+    
+    if age > max_age:
+        threading.Thread(target=_refresh, args=(url, path), daemon=True).start()
+    return metadata
+
+
+# ============================================================================
+# Shared Connection Pool
+# ============================================================================
+
+# HTTPS connection pool shared by every authlib session in the process
+_shared_adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20)
+
+
+class PooledOAuth2Session(OAuth2Session):
+    """authlib requests session that sends through the shared connection pool."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.mount('https://', _shared_adapter)
+
+    def close(self):
+        # authlib closes its session after every call; leave the shared
+        # adapter open so its pooled connections survive for the next one
+        for adapter in self.adapters.values():
+            if adapter is not _shared_adapter:
+                adapter.close()
+
+
+# ============================================================================
+# authlib Integration
+# ============================================================================
+
+class CachedMetadataOAuth2App(FlaskOAuth2App):
+    """OAuth 2.0 client that loads server metadata through the disk cache."""
+    client_cls = PooledOAuth2Session
+
+    def load_server_metadata(self):
+        if self._server_metadata_url and '_loaded_at' not in self.server_metadata:
+            cache_path = Path(current_app.instance_path) / 'oidc-cache' / f'{self.name}.json'
+            max_age = current_app.config.get('OIDC_CACHE_MAX_AGE', 24 * 60 * 60)
+            metadata = load_discovery_document(self._server_metadata_url, cache_path, max_age)
+            metadata['_loaded_at'] = time.time()
+            self.server_metadata.update(metadata)
+        return self.server_metadata
+
+
+class CachedMetadataOAuth(OAuth):
+    """authlib registry whose OAuth 2.0 clients use the discovery cache."""
+    oauth2_client_cls = CachedMetadataOAuth2App
@@ -47,7 +47,7 @@ def update_post(post_id):
         post.content = form.content.data
         db.session.commit()
         flash('Your post has been updated', 'success')
-        return redirect(url_for('posts.post', post_id=post.id))
+        return redirect(url_for('posts.post', post_id=post_id))
     elif request.method == 'GET':
         form.title.data = post.title
         form.content.data = post.content
@@ -20,3 +20,20 @@ class QandAForm(FlaskForm):
     answer5 = TextAreaField('Question Response E:')
     answer5_target = SelectField('Response E Associated Video:', id='answer5_target', coerce=int, validate_choice=False)
     submit = SubmitField('Submit')
+
+    def __init__(self, *args, choices=None, **kwargs):
+        """Build the form, sharing one video choices list across all five target selects."""
+        super().__init__(*args, **kwargs)
+        if choices is not None:
+            for _, target_field in self.answer_fields():
+                target_field.choices = choices
+
+    def answer_fields(self):
+        """Return the (answer, target) field pairs in A-E order."""
+        return [
+            (self.answer1, self.answer1_target),
+            (self.answer2, self.answer2_target),
+            (self.answer3, self.answer3_target),
+            (self.answer4, self.answer4_target),
+            (self.answer5, self.answer5_target),
+        ]
@@ -5,8 +5,13 @@ Handles creation, editing, and deletion of branching questions that appear
 during video playback. Questions can redirect learners to different videos
 based on their answers.
 """
-from flask import Blueprint, abort, current_app, flash, render_template, request
+import time
+
+from flask import (Blueprint, abort, current_app, flash, has_app_context, redirect,
+                   render_template, request, url_for)
 from flask_login import current_user, login_required
+from sqlalchemy import event
+from sqlalchemy.orm import Session, joinedload, object_session
 
 from guidedtopic.extensions import db
 from guidedtopic.models import Question, Video
@@ -15,6 +20,16 @@ from guidedtopic.qna.forms import QandAForm
 
 qna = Blueprint('qna', __name__)
 
+# Seconds a cached video choices list is reused. Changes committed in this
+# process invalidate it immediately; the TTL bounds staleness from other workers.
+VIDEO_CHOICES_TTL = 60
+
+# app.extensions key holding (expires_at, choices) for the answer target selects
+_VIDEO_CHOICES_KEY = 'guidedtopic.video_choices'
+
+# Session.info flag set when a flush writes a Video row
+_VIDEO_CHOICES_STALE = 'guidedtopic.video_choices_stale'
+
 
 # ============================================================================
 # Helper Functions
@@ -30,16 +45,21 @@ def _parse_time_string_to_seconds(time_string):
     Returns:
         int: Total seconds
     
+    Raises:
+        ValueError: If the string is not in HH:MM:SS form
+    
     Example:
         "01:23:45" -> 5025 seconds (1 hour + 23 minutes + 45 seconds)
     """
-    # Extract hours, minutes, seconds from string
-    # Format: "HH:MM:SS" where indices are [0:2], [3:5], [6:8]
-    hours = int(time_string[:2])
-    minutes = int(time_string[3:5])
-    seconds = int(time_string[6:8])
-    
-    return seconds + (60 * minutes) + (60 * 60 * hours)
+    b = time_string.encode('ascii')
+    if len(b) < 8 or b[2] != 58 or b[5] != 58 or not b[:8].replace(b':', b'').isdigit():
+        raise ValueError(f'Invalid HH:MM:SS time string: {time_string!r}')
+    
+    # One multiply-accumulate over the ASCII digits at [0:2], [3:5], [6:8]
+    # (48 is ord('0'), 58 is ord(':'))
+    return ((b[0] - 48) * 36000 + (b[1] - 48) * 3600
+            + (b[3] - 48) * 600 + (b[4] - 48) * 60
+            + (b[6] - 48) * 10 + (b[7] - 48))
 
 
 def _format_seconds_to_time_string(total_seconds):
@@ -55,23 +75,84 @@ def _format_seconds_to_time_string(total_seconds):
     Example:
         5025 seconds -> "01:23:45"
     """
-    hours = int(total_seconds / 3600)
-    minutes = int((total_seconds - hours * 3600) / 60)
-    seconds = total_seconds - hours * 3600 - minutes * 60
+    hours, remainder = divmod(total_seconds, 3600)
+    minutes, seconds = divmod(remainder, 60)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+
+
+def _video_choices():
+    """
+    Return (id, title) pairs for every video, for the answer target selects.
     
-    # Format with leading zeros
-    hours_str = f"{hours:02d}"
-    minutes_str = f"{minutes:02d}"
-    seconds_str = f"{seconds:02d}"
+    Only the two needed columns are selected, so each row comes back as a
+    lightweight tuple instead of a full Video instance. The list is cached
+    per app for VIDEO_CHOICES_TTL seconds and dropped whenever a commit
+    writes a Video.
+    """
+    now = time.monotonic()
+    cached = current_app.extensions.get(_VIDEO_CHOICES_KEY)
+    if cached is not None and cached[0] > now:
+        return cached[1]
+    
+    rows = db.session.query(Video.id, Video.title).order_by(Video.id)
+    choices = [(v_id, title) for v_id, title in rows]
+    current_app.extensions[_VIDEO_CHOICES_KEY] = (now + VIDEO_CHOICES_TTL, choices)
+    return choices
+
+
+def invalidate_video_choices(app=None):
+    """Drop the cached video choices list for ``app`` (default: current_app)."""
+    (app or current_app).extensions.pop(_VIDEO_CHOICES_KEY, None)
+
+
+def _mark_video_choices_stale(mapper, connection, target):
+    """Flag the flushing session so its commit drops the cached choices."""
+    session = object_session(target)
+    if session is not None:
+        session.info[_VIDEO_CHOICES_STALE] = True
+
+
+def _invalidate_after_commit(session):
+    """Drop the cached choices once a Video write is committed."""
+    if session.info.pop(_VIDEO_CHOICES_STALE, False) and has_app_context():
+        invalidate_video_choices()
+
+
+def _discard_stale_flag(session, previous_transaction=None):
+    """Forget a rolled-back Video write; the cached choices are still valid."""
+    session.info.pop(_VIDEO_CHOICES_STALE, None)
+
+
+# Invalidate on commit rather than at flush, so a concurrent request can't
+# refill the cache from rows this transaction is about to replace
+for _event in ('after_insert', 'after_update', 'after_delete'):
+    event.listen(Video, _event, _mark_video_choices_stale)
+event.listen(Session, 'after_commit', _invalidate_after_commit)
+event.listen(Session, 'after_rollback', _discard_stale_flag)
+
+
+def _video_questions(video):
+    """
+    Return a video's questions in pose_time order as a list.
     
-    return f"{hours_str}:{minutes_str}:{seconds_str}"
+    showallquestions.html renders each question's answers, so full rows are
+    needed; returning a list lets the template check for emptiness without
+    issuing a separate COUNT query.
+    """
+    return Question.query.filter_by(video_id=video.id).order_by(Question.pose_time).all()
+
+
+def _submitted_answers(form):
+    """Return the submitted (content, target_vid) pairs in A-E order."""
+    return [(answer_field.data, target_field.data)
+            for answer_field, target_field in form.answer_fields()]
 
 
 # ============================================================================
 # Question Management Routes
 # ============================================================================
 
-@qna.route("/question_editor/<v_id>", methods=['GET', 'POST'])
+@qna.route("/question_editor/<int:v_id>", methods=['GET', 'POST'])
 def question_editor(v_id):
     """
     Create a new question for the selected video at a specific time.
@@ -83,20 +164,20 @@ def question_editor(v_id):
         1. Validate user has educator permissions
         2. Load all videos for answer target selection
         3. On submit: Parse time string, create question with branching answers
-        4. Each answer can redirect to a different video (targetvidA-E)
+        4. Each answer can redirect to a different video (target_vid)
     
     Branching Logic:
         Questions have up to 5 answer choices (A-E), each with:
         - content: Answer text displayed to learner
-        - targetvid: Video ID to redirect to if this answer is selected
-        - If targetvid is 0 or None, continue with current video
+        - target_vid: Video ID to redirect to if this answer is selected
+        - If target_vid is 0 or None, continue with current video
     """
     # Authorization check: only educators can create questions
     if current_user.uploadsvideo == 0:
         abort(403)
     
-    form = QandAForm()
-    allvideos = Video.query.all()
+    video = Video.query.get_or_404(v_id)
+    form = QandAForm(choices=_video_choices())
     
     if form.validate_on_submit():
         # Parse time string (HH:MM:SS) to seconds for storage
@@ -108,46 +189,26 @@ def question_editor(v_id):
             content=form.question.data,
             video_id=v_id,
             pose_time=pose_time_seconds,
-            contentA=form.answer1.data,
-            targetvidA=form.answer1_target.data,
-            contentB=form.answer2.data,
-            targetvidB=form.answer2_target.data,
-            contentC=form.answer3.data,
-            targetvidC=form.answer3_target.data,
-            contentD=form.answer4.data,
-            targetvidD=form.answer4_target.data,
-            contentE=form.answer5.data,
-            targetvidE=form.answer5_target.data
         )
+        q.set_answers(_submitted_answers(form))
         
         db.session.add(q)
         db.session.commit()
         
         # Return to question list for this video
-        video = Video.query.get_or_404(v_id)
-        questions = Question.query.filter_by(associated_video=video).order_by(Question.pose_time)
+        questions = _video_questions(video)
         flash('Q&A addition complete', 'success')
-        return render_template('showallquestions.html', questions=questions, video=video, videos=allvideos)
-    
-    # Pre-populate form with video choices for answer targets
-    video = Video.query.get_or_404(v_id)
-    all_vid_choices = [(v.id, v.title) for v in allvideos]
-    form.answer1_target.choices = all_vid_choices
-    form.answer2_target.choices = all_vid_choices
-    form.answer3_target.choices = all_vid_choices
-    form.answer4_target.choices = all_vid_choices
-    form.answer5_target.choices = all_vid_choices
+        return render_template('showallquestions.html', questions=questions, video=video)
     
     return render_template(
         'question_editor.html',
         video=video,
         form=form,
-        allvideos=allvideos,
         legend=f'Question Editor: {video.title}',
     )
 
 
-@qna.route("/revise_question/<q_id>", methods=['GET', 'POST'])
+@qna.route("/revise_question/<int:q_id>", methods=['GET', 'POST'])
 def revise_question(q_id):
     """
     Edit an existing branching question for a given video.
@@ -160,12 +221,11 @@ def revise_question(q_id):
         - Pose time (when question appears in video)
         - Answer choices and their target videos
     """
-    form = QandAForm()
-    allvideos = Video.query.all()
+    form = QandAForm(choices=_video_choices())
     
     if form.validate_on_submit():
         # Update question record
-        record = Question.query.filter_by(id=q_id).first()
+        record = Question.query.get_or_404(q_id)
         record.content = form.question.data
         
         # Parse and update pose time
@@ -174,73 +234,47 @@ def revise_question(q_id):
         record.pose_time = pose_time_seconds
         
         # Update all answer choices and targets
-        record.contentA = form.answer1.data
-        record.targetvidA = form.answer1_target.data
-        record.contentB = form.answer2.data
-        record.targetvidB = form.answer2_target.data
-        record.contentC = form.answer3.data
-        record.targetvidC = form.answer3_target.data
-        record.contentD = form.answer4.data
-        record.targetvidD = form.answer4_target.data
-        record.contentE = form.answer5.data
-        record.targetvidE = form.answer5_target.data
+        record.set_answers(_submitted_answers(form))
         
         db.session.commit()
         flash('Q & A revision completed', 'success')
         
-        # Return to course video admin view
+        # Return to course video admin view (redirect so a reload doesn't resubmit)
         page = request.args.get('page', 1, type=int)
-        vids = Video.query.order_by(Video.id).paginate(page=page, per_page=3)
-        qs = Question.query.order_by(Question.video_id).order_by(Question.pose_time)
-        return render_template('course_video.html', videos=vids, questions=qs)
+        return redirect(url_for('videos.course_video', page=page))
     
     # Handle validation errors
     if request.method == 'POST':
         flash('Failed Validation')
-        time_string = form.pose_time.raw_data[0]
-        pose_time_seconds = _parse_time_string_to_seconds(time_string)
     
     # Load existing question and pre-populate form
-    question = Question.query.get_or_404(q_id)
+    # Load the owning video in the same query
+    question = Question.query.options(joinedload(Question.associated_video)).get_or_404(q_id)
     video = question.associated_video
     
-    # Set video choices for answer targets
-    all_vid_choices = [(v.id, v.title) for v in allvideos]
-    form.answer1_target.choices = all_vid_choices
-    form.answer2_target.choices = all_vid_choices
-    form.answer3_target.choices = all_vid_choices
-    form.answer4_target.choices = all_vid_choices
-    form.answer5_target.choices = all_vid_choices
-    
     # Pre-populate form fields with existing question data
     form.question.data = question.content
     
     # Convert pose_time (seconds) back to HH:MM:SS format for display
     pose_time_string = _format_seconds_to_time_string(question.pose_time)
     
-    form.answer1.data = question.contentA
-    form.answer1_target.data = question.targetvidA
-    form.answer2.data = question.contentB
-    form.answer2_target.data = question.targetvidB
-    form.answer3.data = question.contentC
-    form.answer3_target.data = question.targetvidC
-    form.answer4.data = question.contentD
-    form.answer4_target.data = question.targetvidD
-    form.answer5.data = question.contentE
-    form.answer5_target.data = question.targetvidE
+    answer_fields = form.answer_fields()
+    for answer in question.answers:
+        answer_field, target_field = answer_fields[answer.position]
+        answer_field.data = answer.content
+        target_field.data = answer.target_vid
     
     return render_template(
         'question_editor.html',
         q_id=q_id,
         video=video,
         form=form,
-        allvideos=allvideos,
         legend=f'Revise question for video titled "{video.title}"',
         pose_time_hint=pose_time_string,
     )
 
 
-@qna.route("/showallquestions/<v_id>")
+@qna.route("/showallquestions/<int:v_id>")
 def showallquestions(v_id):
     """
     List all questions associated with a video for quick review.
@@ -256,10 +290,9 @@ def showallquestions(v_id):
         abort(403)
     
     video = Video.query.get_or_404(v_id)
-    videos = Video.query.all()
     blank = 'blank'  # Used in template for display logic
-    questions = Question.query.filter_by(associated_video=video).order_by(Question.pose_time)
-    return render_template('showallquestions.html', questions=questions, video=video, videos=videos, blank=blank)
+    questions = _video_questions(video)
+    return render_template('showallquestions.html', questions=questions, video=video, blank=blank)
 
 
 @qna.route("/question/<int:q_id>/delete/", methods=['GET', 'POST'])
@@ -277,7 +310,7 @@ def delete_question(q_id):
     if current_user.uploadsvideo == 0:
         abort(403)
     
-    v_id = request.args.get('v_id')
+    v_id = request.args.get('v_id', type=int)
     question = Question.query.get_or_404(q_id)
     
     db.session.delete(question)
@@ -285,7 +318,6 @@ def delete_question(q_id):
     
     # Return to question list for the video
     video = Video.query.get_or_404(v_id)
-    videos = Video.query.all()
-    questions = Question.query.filter_by(associated_video=video).order_by(Question.pose_time)
+    questions = _video_questions(video)
     flash('Question has been deleted', 'success')
-    return render_template('showallquestions.html', questions=questions, video=video, videos=videos)
+    return render_template('showallquestions.html', questions=questions, video=video)
@@ -3,9 +3,15 @@ from flask_wtf.file import FileField, FileAllowed
 from wtforms import StringField, PasswordField, SubmitField, BooleanField
 from wtforms.validators import DataRequired, Length, Email, EqualTo, ValidationError
 from flask_login import current_user
+from guidedtopic.extensions import db
 from guidedtopic.models import User
 
 
+def _user_exists(**criteria):
+    """Return whether a user matches ``criteria`` without loading the row."""
+    return db.session.query(User.query.filter_by(**criteria).exists()).scalar()
+
+
 class RegistrationForm(FlaskForm):
     """Collect basic credentials for creating a new user account."""
     username = StringField('Username', validators=[
@@ -17,13 +23,11 @@ class RegistrationForm(FlaskForm):
     submit = SubmitField('Sign Up')
 
     def validate_username(self, username):
-        user = User.query.filter_by(username=username.data).first()
-        if user:
+        if _user_exists(username=username.data):
             raise ValidationError('That username is taken')
 
     def validate_email(self, email):
-        user = User.query.filter_by(email=email.data).first()
-        if user:
+        if _user_exists(email=email.data):
             raise ValidationError('That email is already registered')
 
 
@@ -45,14 +49,12 @@ class UpdateAccountForm(FlaskForm):
 
     def validate_username(self, username):
         if username.data != current_user.username:
-            user = User.query.filter_by(username=username.data).first()
-            if user:
+            if _user_exists(username=username.data):
                 raise ValidationError('That username is taken')
 
     def validate_email(self, email):
         if email.data != current_user.email:
-            user = User.query.filter_by(email=email.data).first()
-            if user:
+            if _user_exists(email=email.data):
                 raise ValidationError('That email is already registered')
 
 
@@ -62,8 +64,7 @@ class RequestResetForm(FlaskForm):
     submit = SubmitField('Request Password Reset')
 
     def validate_email(self, email):
-        user = User.query.filter_by(email=email.data).first()
-        if user is None:
+        if not _user_exists(email=email.data):
             raise ValidationError('There is no account with that email.')
 
 
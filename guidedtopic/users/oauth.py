@@ -10,19 +10,38 @@ This module handles the OAuth authentication flow:
 """
 from flask import Blueprint, redirect, url_for, current_app, flash
 from flask_login import login_user
-from guidedtopic.extensions import oauth, db
+from sqlalchemy import and_, or_
+from sqlalchemy.exc import IntegrityError
+from guidedtopic.extensions import db, ensure_provider, oauth
 from guidedtopic.models import User
 
 oauth_bp = Blueprint('oauth', __name__, url_prefix='/auth')
 
 # Supported OAuth providers
-SUPPORTED_PROVIDERS = ['google', 'azure']
+SUPPORTED_PROVIDERS = frozenset(('google', 'azure'))
 
 
 # ============================================================================
 # OAuth Flow Routes
 # ============================================================================
 
+def _get_client(provider):
+    """
+    Return the OAuth client for a supported, configured provider.
+    
+    Returns None after flashing the reason when the provider is unknown or
+    has no credentials; configured providers are registered on first use.
+    """
+    if provider not in SUPPORTED_PROVIDERS:
+        flash('Unsupported authentication provider', 'danger')
+        return None
+    
+    client = ensure_provider(provider)
+    if client is None:
+        flash(f'{provider.title()} authentication is not configured', 'danger')
+    return client
+
+
 @oauth_bp.route('/<provider>')
 def oauth_login(provider):
     """
@@ -37,19 +56,14 @@ def oauth_login(provider):
         3. Generate redirect URI for callback
         4. Redirect user to provider's authorization page
     """
-    # Validate provider is supported
-    if provider not in SUPPORTED_PROVIDERS:
-        flash('Unsupported authentication provider', 'danger')
-        return redirect(url_for('users.login'))
-    
-    # Check provider is configured (has credentials)
-    if provider not in oauth.providers:
-        flash(f'{provider.title()} authentication is not configured', 'danger')
+    # Validate provider is supported and configured
+    client = _get_client(provider)
+    if client is None:
         return redirect(url_for('users.login'))
     
     # Generate callback URL and redirect to provider
     redirect_uri = url_for('oauth.oauth_callback', provider=provider, _external=True)
-    return oauth.providers[provider].authorize_redirect(redirect_uri)
+    return client.authorize_redirect(redirect_uri)
 
 
 @oauth_bp.route('/<provider>/callback')
@@ -71,21 +85,17 @@ def oauth_callback(provider):
     Errors are caught and logged without exposing sensitive information.
     """
     # Validate provider
-    if provider not in SUPPORTED_PROVIDERS:
-        flash('Unsupported authentication provider', 'danger')
-        return redirect(url_for('users.login'))
-    
-    if provider not in oauth.providers:
-        flash(f'{provider.title()} authentication is not configured', 'danger')
+    client = _get_client(provider)
+    if client is None:
         return redirect(url_for('users.login'))
     
     try:
         # Step 1: Exchange authorization code for access token
-        token = oauth.providers[provider].authorize_access_token()
+        token = client.authorize_access_token()
         
         # Step 2: Fetch user information from provider (provider-specific)
         if provider == 'google':
-            user_info = _get_google_user_info(provider)
+            user_info = _get_google_user_info(provider, token)
         elif provider == 'azure':
             user_info = _get_azure_user_info(provider, token)
         else:
@@ -116,12 +126,13 @@ def oauth_callback(provider):
 # Provider-Specific User Info Extraction
 # ============================================================================
 
-def _get_google_user_info(provider):
+def _get_google_user_info(provider, token):
     """
     Extract user information from Google's OAuth response.
     
     Args:
         provider: Provider name (must be 'google')
+        token: OAuth token containing access token and ID token claims
     
     Returns:
         dict: User information with keys:
@@ -132,11 +143,24 @@ def _get_google_user_info(provider):
             - verified_email: Email verification status
             - hd: Google Workspace domain (if applicable)
     
-    Uses Google's userinfo v2 API endpoint.
+    Reads the claims authlib validated from the ID token, falling back to
+    Google's userinfo v2 API endpoint if they lack the user ID or email.
     """
-    resp = oauth.google.get('https://www.googleapis.com/oauth2/v2/userinfo')
-    resp.raise_for_status()
-    user_data = resp.json()
+    claims = token.get('userinfo') or {}
+    if claims.get('sub') and claims.get('email'):
+        # ID token 'sub' is the same identifier userinfo v2 returns as 'id'
+        user_data = {
+            'id': claims['sub'],
+            'email': claims['email'],
+            'verified_email': claims.get('email_verified', False),
+        }
+        for key in ('name', 'picture', 'hd'):
+            if key in claims:
+                user_data[key] = claims[key]
+    else:
+        resp = oauth.google.get('https://www.googleapis.com/oauth2/v2/userinfo')
+        resp.raise_for_status()
+        user_data = resp.json()
     
     return {
         'id': str(user_data['id']),
@@ -165,11 +189,23 @@ def _get_azure_user_info(provider, token):
             - family_name: Last name (optional)
             - tenant_id: Azure AD tenant ID (if available)
     
-    Uses Microsoft Graph API to fetch user profile.
+    Reads the claims authlib validated from the ID token, falling back to
+    the Microsoft Graph API if they lack the object ID or email.
     """
-    resp = oauth.azure.get('https://graph.microsoft.com/v1.0/me')
-    resp.raise_for_status()
-    user_data = resp.json()
+    claims = token.get('userinfo') or {}
+    if claims.get('oid') and claims.get('email'):
+        # Map ID token claims onto the Graph /me field names
+        user_data = {
+            'id': claims['oid'],
+            'mail': claims['email'],
+            'displayName': claims.get('name', ''),
+            'givenName': claims.get('given_name', ''),
+            'surname': claims.get('family_name', ''),
+        }
+    else:
+        resp = oauth.azure.get('https://graph.microsoft.com/v1.0/me')
+        resp.raise_for_status()
+        user_data = resp.json()
     
     # Extract tenant ID from config or token
     tenant_id = current_app.config.get('AZURE_AD_TENANT_ID')
@@ -178,8 +214,8 @@ def _get_azure_user_info(provider, token):
         tenant_id = None
     
     # Try to get tenant from token claims if not in config
-    if not tenant_id and 'id_token_claims' in token:
-        tenant_id = token.get('id_token_claims', {}).get('tid')
+    if not tenant_id:
+        tenant_id = claims.get('tid')
     
     return {
         'id': user_data['id'],  # Object ID in Entra ID
@@ -216,19 +252,34 @@ def _find_or_create_oauth_user(provider, user_info):
           the OAuth credentials are linked to the existing account
         - This allows users to use either authentication method
     """
+    try:
+        return _resolve_oauth_user(provider, user_info)
+    except IntegrityError:
+        # A concurrent sign-in claimed the username, email or provider ID
+        # between our lookups and the commit; its row is visible now
+        db.session.rollback()
+        return _resolve_oauth_user(provider, user_info)
+
+
+def _resolve_oauth_user(provider, user_info):
+    """Look up, link or create the user; see _find_or_create_oauth_user()."""
+    # Fetch both candidates in one round trip: the account already linked to
+    # this provider ID and the account registered with this email. Both
+    # columns are unique, so at most two rows come back.
+    candidates = User.query.filter(or_(
+        and_(User.oauth_provider == provider, User.oauth_id == user_info['id']),
+        User.email == user_info['email'],
+    )).all()
+    
     # Step 1: Check if OAuth account already exists
     # (User has signed in with this provider before)
-    user = User.query.filter_by(
-        oauth_provider=provider,
-        oauth_id=user_info['id']
-    ).first()
-    
-    if user:
-        return user
+    for user in candidates:
+        if user.oauth_provider == provider and user.oauth_id == user_info['id']:
+            return user
     
     # Step 2: Check if email already exists (account linking)
     # (User has account with password, now signing in with OAuth)
-    existing_user = User.query.filter_by(email=user_info['email']).first()
+    existing_user = next((u for u in candidates if u.email == user_info['email']), None)
     
     if existing_user:
         # Link OAuth credentials to existing account
@@ -256,11 +307,17 @@ def _find_or_create_oauth_user(provider, user_info):
     base_username = username
     counter = 1
     
+    # Fetch every username the suffix loop could collide with in one query
+    # (suffixes up to 5 digits only truncate the base past its 15th character)
+    taken = {
+        name for (name,) in db.session.query(User.username)
+        .filter(User.username.startswith(base_username[:15], autoescape=True))
+    }
+    
     # If username exists, append number suffix
-    while User.query.filter_by(username=username).first():
-        suffix = str(counter)
+    while username in taken:
         # Ensure total length doesn't exceed 20
-        username = (base_username[:20-len(suffix)] + suffix)[:20]
+        username = f'{base_username[:20 - len(str(counter))]}{counter}'
         counter += 1
     
     # Create new user (OAuth-only, no password)
@@ -1,5 +1,9 @@
+import secrets
+from functools import lru_cache
+
 from flask import Blueprint, current_app, flash, redirect, render_template, request, url_for
 from flask_login import current_user, login_required, login_user, logout_user
+from sqlalchemy.orm import contains_eager
 
 from guidedtopic.extensions import bcrypt, db
 from guidedtopic.models import Post, User
@@ -10,12 +14,19 @@ from guidedtopic.users.forms import (
     ResetPasswordForm,
     UpdateAccountForm,
 )
-from guidedtopic.users.utils import save_picture, send_reset_email, send_upgrade_request
+from guidedtopic.users.utils import (hash_password, save_picture, send_reset_email,
+                                     send_upgrade_request)
 
 
 users = Blueprint('users', __name__)
 
 
+@lru_cache(maxsize=4)
+def _dummy_password_hash(rounds):
+    """Return a bcrypt hash of a random password, generated once per work factor."""
+    return bcrypt.generate_password_hash(secrets.token_hex(16), rounds).decode('utf-8')
+
+
 # ============================================================================
 # Authentication Routes
 # ============================================================================
@@ -30,7 +41,7 @@ def register():
     form = RegistrationForm()
     if form.validate_on_submit():
         # Hash password securely before storing
-        hashed_password = bcrypt.generate_password_hash(form.password.data).decode('utf-8')
+        hashed_password = hash_password(form.password.data)
         user = User(
             username=form.username.data,
             email=form.email.data,
@@ -61,10 +72,17 @@ def login():
     form = LoginForm()
     if form.validate_on_submit():
         user = User.query.filter_by(email=form.email.data).first()
+        has_password = user is not None and bool(user.password)
         
-        # Check password only if user exists and has a password set
-        # OAuth-only users won't have a password, so this check prevents errors
-        if user and user.password and bcrypt.check_password_hash(user.password, form.password.data):
+        # Always run one bcrypt check so unknown emails and OAuth-only users
+        # (no password) take as long to reject as a wrong password
+        if has_password:
+            password_hash = user.password
+        else:
+            password_hash = _dummy_password_hash(current_app.config.get('BCRYPT_LOG_ROUNDS'))
+        password_ok = bcrypt.check_password_hash(password_hash, form.password.data)
+        
+        if has_password and password_ok:
             login_user(user, remember=form.remember.data)
             next_page = request.args.get('next')
             current_app.logger.info('%s logged in successfully', user.username)
@@ -128,7 +146,7 @@ def reset_token(token):
     form = ResetPasswordForm()
     if form.validate_on_submit():
         # Hash new password securely
-        hashed_password = bcrypt.generate_password_hash(form.password.data).decode('utf-8')
+        hashed_password = hash_password(form.password.data)
         user.password = hashed_password
         db.session.commit()
         flash('Password updated, you may now login', 'success')
@@ -180,10 +198,19 @@ def account():
 def user_posts(username):
     """List all posts authored by the specified user."""
     page = request.args.get('page', 1, type=int)
-    user = User.query.filter_by(username=username).first_or_404()
-    posts = Post.query.filter_by(author=user)\
+    # Filter on the joined author so the page's posts and their author
+    # come back in one query
+    posts = Post.query.join(Post.author)\
+        .filter(User.username == username)\
+        .options(contains_eager(Post.author))\
         .order_by(Post.date_posted.desc())\
         .paginate(page=page, per_page=4)
+    
+    # Only a user without posts needs a separate lookup (or a 404)
+    if posts.items:
+        user = posts.items[0].author
+    else:
+        user = User.query.filter_by(username=username).first_or_404()
     return render_template('user_posts.html', posts=posts, user=user)
 
 
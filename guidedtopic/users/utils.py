@@ -1,5 +1,7 @@
+import hashlib
 import os
 import secrets
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import List, Optional
 
 from PIL import Image
@@ -7,22 +9,78 @@ from flask import current_app, url_for
 from flask_login import current_user
 from flask_mail import Message
 
-from guidedtopic.extensions import mail
+from guidedtopic.extensions import bcrypt, mail
+
+
+def hash_password(password: str) -> str:
+    """Hash ``password`` with the current app's bcrypt work factor."""
+    # Read the work factor per call: the shared Bcrypt extension only keeps
+    # the value from whichever app called init_app() last
+    rounds = current_app.config.get("BCRYPT_LOG_ROUNDS")
+    return bcrypt.generate_password_hash(password, rounds).decode("utf-8")
+
+
+# File extension for each image format profile pictures are stored in
+PICTURE_EXTENSIONS = {"JPEG": ".jpg", "PNG": ".png"}
+
+
+def _content_digest(stream) -> str:
+    """Return a 16-character hex digest of ``stream``, rewinding it afterwards."""
+    digest = hashlib.blake2b(digest_size=8)
+    for chunk in iter(lambda: stream.read(64 * 1024), b""):
+        digest.update(chunk)
+    stream.seek(0)
+    return digest.hexdigest()
 
 
 def save_picture(form_picture):
     """Store an uploaded profile picture and return the generated filename."""
-    random_hex = secrets.token_hex(8)
-    _, f_ext = os.path.splitext(form_picture.filename)
-    picture_fn = random_hex + f_ext
+    # Name the file after its content so re-uploads of the same image share
+    # one stored thumbnail and skip the resize
+    content_hash = _content_digest(form_picture.stream)
+    i = Image.open(form_picture.stream)
+    # Take the extension from the detected format, not the client's filename;
+    # anything other than JPEG is stored as PNG
+    image_format = i.format if i.format in PICTURE_EXTENSIONS else "PNG"
+    picture_fn = content_hash + PICTURE_EXTENSIONS[image_format]
     picture_path = os.path.join(current_app.root_path, 'static/profile_pics', picture_fn)
-    i = Image.open(form_picture)
+    if os.path.exists(picture_path):
+        return picture_fn
+
     i.thumbnail((125, 125))
-    i.save(picture_path)
+
+    # Write to a temporary name first so a failed save never leaves a
+    # partial file at the path the account will point to; the name is random
+    # because two identical uploads can now target the same picture_path
+    tmp_path = f'{picture_path}.{secrets.token_hex(4)}.tmp'
+    try:
+        i.save(tmp_path, format=image_format)
+        os.replace(tmp_path, picture_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
 
     return picture_fn
 
 
+# Background threads that deliver mail so SMTP never blocks a request
+_mail_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="mail")
+
+
+def _deliver(app, msg: Message) -> None:
+    """Send ``msg`` inside ``app``'s context, logging any SMTP failure."""
+    with app.app_context():
+        try:
+            mail.send(msg)
+        except Exception:
+            app.logger.exception("Sending email %r to %s failed", msg.subject, msg.recipients)
+
+
+def _send_async(msg: Message) -> Future:
+    """Queue ``msg`` for delivery on a background thread."""
+    return _mail_executor.submit(_deliver, current_app._get_current_object(), msg)
+
+
 def _mail_sender() -> Optional[str]:
     """Return the configured default sender address if available."""
     return current_app.config.get("MAIL_DEFAULT_SENDER") or current_app.config.get("MAIL_USERNAME")
@@ -30,15 +88,15 @@ def _mail_sender() -> Optional[str]:
 
 def _support_recipients() -> List[str]:
     """Derive the list of addresses that receive upgrade requests."""
-    configured = current_app.config.get("SUPPORT_RECIPIENTS", [])
+    configured = current_app.config.get("SUPPORT_RECIPIENTS", ())
     if configured:
-        return configured
+        return list(configured)
     sender = _mail_sender()
     return [sender] if sender else []
 
 
-def send_reset_email(user):
-    """Email a password reset link to the supplied user."""
+def send_reset_email(user) -> Future:
+    """Queue an email with a password reset link to the supplied user."""
     token = user.get_reset_token()
     sender = _mail_sender()
     msg = Message(
@@ -51,15 +109,15 @@ def send_reset_email(user):
         f"{url_for('users.reset_token', token=token, _external=True)}\n"
         "If you didn't request password reset, simply ignore this email."
     )
-    mail.send(msg)
+    return _send_async(msg)
 
 
-def send_upgrade_request():
-    """Notify support that the current user needs additional privileges."""
+def send_upgrade_request() -> Optional[Future]:
+    """Queue a note to support that the current user needs additional privileges."""
     recipients = _support_recipients()
     if not recipients:
         current_app.logger.warning("Support recipients not configured; upgrade request email not sent")
-        return
+        return None
 
     msg = Message(
         'Request for Feature Upgrade - Video Upload',
@@ -70,4 +128,4 @@ def send_upgrade_request():
         'The following account requests enablement of video upload capability: '
         f'{current_user.email}'
     )
-    mail.send(msg)
+    return _send_async(msg)
@@ -1,5 +1,5 @@
 from flask_wtf import FlaskForm
-from wtforms import StringField, SubmitField, FloatField, FileField, BooleanField
+from wtforms import StringField, SubmitField, FloatField, FileField, BooleanField, HiddenField
 from wtforms.validators import DataRequired
 from flask_wtf.file import FileAllowed, FileRequired
 
@@ -12,3 +12,24 @@ class PostVideoForm(FlaskForm):
     duration = FloatField('Duration')
     is_remedial = BooleanField('Is Remedial')
     submit = SubmitField('Upload')
+
+
+class ReviseVideoForm(FlaskForm):
+    """Edit the metadata of an uploaded video; the file itself is not replaced."""
+    title = StringField('Title', validators=[DataRequired()])
+    description = StringField('Description')
+    is_remedial = BooleanField('Is Remedial')
+    submit = SubmitField('Update')
+
+
+class SignVideoUploadForm(FlaskForm):
+    """Request a presigned S3 upload for the file an educator picked."""
+    filename = StringField('Filename', validators=[DataRequired()])
+
+
+class CompleteVideoUploadForm(FlaskForm):
+    """Record a video the browser uploaded directly to S3."""
+    title = StringField('Title', validators=[DataRequired()])
+    description = StringField('Description')
+    is_remedial = BooleanField('Is Remedial')
+    storage_key = HiddenField('Storage Key', validators=[DataRequired()])
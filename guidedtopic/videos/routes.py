@@ -7,23 +7,73 @@ Routes are organized by functionality:
 - Edit: Routes for editing/deleting videos (educators)
 - Admin: Routes for administrative video management
 """
+import base64
+import hashlib
 import mimetypes
+import time
 from pathlib import Path
 from uuid import uuid4
 
-from flask import (Blueprint, abort, current_app, flash, redirect,
-                   render_template, request, url_for)
+from flask import (Blueprint, abort, current_app, flash, jsonify, redirect,
+                   render_template, request, session, url_for)
 from flask_login import current_user, login_required
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import load_only
 from werkzeug.utils import secure_filename
 
 from guidedtopic.extensions import db
-from guidedtopic.models import Question, Video
-from guidedtopic.videos.forms import PostVideoForm
-from guidedtopic.videos.utils import UploadError, build_video_url, upload_video_to_s3
+from guidedtopic.models import Question, QuestionAnswer, Video
+from guidedtopic.videos.forms import (CompleteVideoUploadForm, PostVideoForm, ReviseVideoForm,
+                                      SignVideoUploadForm)
+from guidedtopic.videos.utils import (UploadError, build_video_url, confirm_video_upload,
+                                      presign_video_upload, upload_video_to_s3)
 
 
 videos = Blueprint('videos', __name__)
 
+# Columns the video list pages render; the rest stay unloaded
+_LIST_COLUMNS = load_only(Video.id, Video.title, Video.description)
+
+# Content types for common video extensions, so uploads of allowed types need
+# no mimetypes lookup; extensions added via config fall back to mimetypes
+VIDEO_CONTENT_TYPES = {
+    "mp4": "video/mp4",
+    "m4v": "video/mp4",
+    "mov": "video/quicktime",
+    "webm": "video/webm",
+    "mkv": "video/x-matroska",
+    "avi": "video/x-msvideo",
+}
+
+# Repeat views of a video from the same session within this many seconds
+# (reloads, player re-requests) are not added to total_views
+VIEW_DEDUPE_SECONDS = 10 * 60
+
+
+def _count_view(video_id):
+    """
+    Record a view of ``video_id`` in the session and say whether to count it.
+    
+    Args:
+        video_id: Video ID
+    
+    Returns:
+        bool: False if this session already counted the video recently
+    
+    Timestamps live in the signed session cookie, so the check needs no
+    shared store; entries older than VIEW_DEDUPE_SECONDS are pruned.
+    """
+    now = int(time.time())
+    recent = {
+        key: viewed_at for key, viewed_at in session.get('recent_views', {}).items()
+        if now - viewed_at < VIEW_DEDUPE_SECONDS
+    }
+    counted = str(video_id) not in recent
+    if counted:
+        recent[str(video_id)] = now
+    session['recent_views'] = recent
+    return counted
+
 
 # ============================================================================
 # Public/Viewing Routes (Learners)
@@ -50,7 +100,8 @@ def select_video():
     Remedial videos are shown separately via remedialvideos route.
     """
     page = request.args.get('page', 1, type=int)
-    videos = Video.query.filter_by(is_remedial=False).order_by(Video.id).paginate(page=page, per_page=3)
+    videos = Video.query.options(_LIST_COLUMNS).filter_by(is_remedial=False)\
+        .order_by(Video.id).paginate(page=page, per_page=3)
     return render_template('selectvideo.html', title='Select Video', videos=videos)
 
 
@@ -64,11 +115,12 @@ def remedialvideos():
     and need additional instruction before continuing.
     """
     page = request.args.get('page', 1, type=int)
-    videos = Video.query.filter_by(is_remedial=1).order_by(Video.id).paginate(page=page, per_page=3)
+    videos = Video.query.options(_LIST_COLUMNS).filter_by(is_remedial=1)\
+        .order_by(Video.id).paginate(page=page, per_page=3)
     return render_template('remedialvideos.html', title='Remedial Videos', videos=videos)
 
 
-@videos.route("/study_video/<v_id>")
+@videos.route("/study_video/<int:v_id>")
 @login_required
 def study_video(v_id):
     """
@@ -82,21 +134,31 @@ def study_video(v_id):
         - Tracks view count
         - Questions are ordered by pose_time (when they appear in video)
     """
-    video = Video.query.get_or_404(v_id)
-    questions = Question.query.filter_by(associated_video=video).order_by(Question.pose_time)
+    # Increment view counter in SQL so concurrent views are not lost;
+    # reloads within VIEW_DEDUPE_SECONDS of a counted view are skipped.
+    # Counting before loading means the commit expires nothing we render,
+    # so the video and questions below are each read exactly once.
+    if _count_view(v_id):
+        result = db.session.execute(
+            update(Video)
+            .where(Video.id == v_id)
+            .values(total_views=func.coalesce(Video.total_views, 0) + 1)
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        if result.rowcount == 0:
+            abort(404)
     
-    # Increment view counter
-    views = video.total_views + 1
-    video.total_views = views
-    db.session.add(video)
-    db.session.commit()
+    video = Video.query.get_or_404(v_id)
+    questions = Question.query.filter_by(video_id=video.id).order_by(Question.pose_time).all()
+    views = video.total_views
     
     current_app.logger.info('%s accessing study_video route w/ v_id %s', current_user.username, v_id)
     return render_template('study_video.html', video=video, questions=questions, 
                           rp=current_app.root_path, views=views)
 
 
-@videos.route("/getvideopath/<v_id>", methods=['GET', 'POST'])
+@videos.route("/getvideopath/<int:v_id>")
 @login_required
 def getvideopath(v_id):
     """
@@ -106,18 +168,87 @@ def getvideopath(v_id):
         v_id: Video ID
     
     Returns:
-        str: S3 URL or streaming URL for the video file
+        JSON: {"url": S3 URL or streaming URL for the video file}
     
-    Used by frontend JavaScript to fetch video URLs dynamically.
+    Used by frontend JavaScript to fetch video URLs dynamically. The URL
+    never changes once a video is uploaded, so the response carries an
+    ETag derived from it and may be cached by the browser; repeat lookups
+    are answered with 304 Not Modified.
     """
-    video = Video.query.filter_by(id=v_id).first()
-    return video.video_file
+    video_file = db.session.scalar(select(Video.video_file).where(Video.id == v_id))
+    if video_file is None:
+        abort(404)
+    
+    response = jsonify(url=video_file)
+    # Private: the route requires login, so shared caches must not store it
+    response.cache_control.private = True
+    response.cache_control.max_age = 3600
+    response.set_etag(hashlib.blake2b(f'{v_id}:{video_file}'.encode(), digest_size=8).hexdigest())
+    return response.make_conditional(request)
 
 
 # ============================================================================
 # Upload Routes (Educators)
 # ============================================================================
 
+def _plan_upload(filename):
+    """
+    Validate an upload's filename and choose where it is stored.
+    
+    Args:
+        filename: Filename supplied by the client
+    
+    Returns:
+        tuple: (storage_key, content_type)
+    
+    Raises:
+        ValueError: With a user-facing message if the name or extension is rejected
+    """
+    # Sanitize filename to prevent path traversal attacks
+    original_name = secure_filename(filename)
+    if not original_name:
+        raise ValueError("Invalid file name.")
+    
+    # Validate file extension against whitelist (a frozenset built by Config)
+    suffix = Path(original_name).suffix.lower()
+    extension = suffix[1:]
+    allowed_extensions = current_app.config.get("UPLOAD_ALLOWED_EXTENSIONS", frozenset())
+    if extension not in allowed_extensions:
+        raise ValueError(
+            f"Unsupported file type '.{extension}'. Allowed types: {', '.join(sorted(allowed_extensions))}."
+        )
+    
+    # Generate unique storage key (user-scoped to prevent collisions)
+    # Format: uploads/{user_id}/{uuid}.{ext}, the UUID as 26 base32 characters
+    # rather than 32 hex so the playback URL fits Video.video_file more easily
+    token = base64.b32encode(uuid4().bytes).rstrip(b"=").decode("ascii").lower()
+    storage_key = f"uploads/{current_user.id}/{token}{suffix}"
+    content_type = (VIDEO_CONTENT_TYPES.get(extension)
+                    or mimetypes.guess_type(original_name)[0]
+                    or "application/octet-stream")
+    return storage_key, content_type
+
+
+def _save_video(form, playback_url):
+    """Create the Video record for an uploaded file and flash completion."""
+    vid = Video(
+        title=form.title.data,
+        description=form.description.data,
+        is_remedial=form.is_remedial.data,
+        video_file=playback_url,  # Store S3 URL, not local path
+        author=current_user,
+        duration=-1,  # Duration not calculated on upload
+    )
+    db.session.add(vid)
+    # Read the username before committing: the commit expires current_user,
+    # and touching it afterwards would reload the row in a second transaction
+    username = current_user.username
+    db.session.commit()
+    
+    current_app.logger.info('%s uploaded video titled %s', username, form.title.data)
+    flash('Video upload complete', 'success')
+
+
 @videos.route("/upload_video", methods=['GET', 'POST'])
 @login_required
 def upload_video():
@@ -133,6 +264,10 @@ def upload_video():
         6. Create Video record with S3 URL
         7. Store metadata in database
     
+    When S3_DIRECT_UPLOAD is enabled the page uploads straight to S3 via
+    sign_video_upload() and complete_video_upload(), and posting the file
+    here is only the fallback.
+    
     Security:
         - Filename sanitization prevents path traversal
         - Extension whitelist prevents malicious file uploads
@@ -152,27 +287,13 @@ def upload_video():
             flash("Please choose a video file to upload.", "warning")
             return redirect(url_for("videos.upload_video"))
         
-        # Step 2: Sanitize filename to prevent path traversal attacks
-        original_name = secure_filename(file_storage.filename)
-        if not original_name:
-            flash("Invalid file name.", "danger")
-            return redirect(url_for("videos.upload_video"))
-        
-        # Step 3: Validate file extension against whitelist
-        extension = Path(original_name).suffix.lower().lstrip(".")
-        allowed_extensions = current_app.config.get("UPLOAD_ALLOWED_EXTENSIONS", set())
-        if extension not in allowed_extensions:
-            flash(
-                f"Unsupported file type '.{extension}'. Allowed types: {', '.join(sorted(allowed_extensions))}.",
-                "danger",
-            )
+        # Steps 2-4: Validate the name and pick a storage key
+        try:
+            storage_key, content_type = _plan_upload(file_storage.filename)
+        except ValueError as exc:
+            flash(str(exc), "danger")
             return redirect(url_for("videos.upload_video"))
         
-        # Step 4: Generate unique storage key (user-scoped to prevent collisions)
-        # Format: uploads/{user_id}/{uuid}.{ext}
-        storage_key = f"uploads/{current_user.id}/{uuid4().hex}{Path(original_name).suffix.lower()}"
-        content_type = mimetypes.guess_type(original_name)[0] or "application/octet-stream"
-        
         # Step 5: Prepare file stream for upload
         file_stream = file_storage.stream
         file_stream.seek(0)
@@ -187,30 +308,89 @@ def upload_video():
             return redirect(url_for("videos.upload_video"))
         
         # Step 7: Create Video record in database
-        vid = Video(
-            title=form.title.data,
-            description=form.description.data,
-            is_remedial=form.is_remedial.data,
-            video_file=playback_url,  # Store S3 URL, not local path
-            author=current_user,
-            duration=-1,  # Duration not calculated on upload
-        )
-        db.session.add(vid)
-        db.session.commit()
-        
-        current_app.logger.info('%s uploaded video titled %s', current_user.username, form.title.data)
-        flash('Video upload complete', 'success')
+        _save_video(form, playback_url)
         return redirect(url_for('main.about'))
     
+    # Let the browser refuse wrong types and oversized files before sending them
+    allowed_extensions = current_app.config.get("UPLOAD_ALLOWED_EXTENSIONS", frozenset())
     return render_template('upload_video.html', form=form,
-                           title="Upload Video", legend='Upload Video')
+                           title="Upload Video", legend='Upload Video',
+                           direct_upload=current_app.config.get('S3_DIRECT_UPLOAD', False),
+                           accept=','.join(f'.{ext}' for ext in sorted(allowed_extensions)),
+                           max_bytes=current_app.config.get('MAX_CONTENT_LENGTH'))
+
+
+@videos.route("/upload_video/sign", methods=['POST'])
+@login_required
+def sign_video_upload():
+    """
+    Issue a presigned S3 POST so the browser can upload a video directly.
+    
+    Returns:
+        JSON with the storage key, the S3 form URL and the signed fields;
+        400 for a rejected filename, 503 if S3 signing is unavailable
+    
+    The signed policy pins the key and content type and caps the size at
+    MAX_CONTENT_LENGTH, so the browser cannot upload anything else with it.
+    """
+    if current_user.uploadsvideo == 0:
+        abort(403)
+    
+    form = SignVideoUploadForm()
+    if not form.validate_on_submit():
+        return jsonify(error="Invalid upload request."), 400
+    
+    try:
+        storage_key, content_type = _plan_upload(form.filename.data)
+    except ValueError as exc:
+        return jsonify(error=str(exc)), 400
+    
+    try:
+        presigned = presign_video_upload(storage_key, content_type, current_app.config["MAX_CONTENT_LENGTH"])
+    except UploadError:
+        current_app.logger.exception("Signing video upload failed for user %s", current_user.id)
+        return jsonify(error="Direct upload is unavailable."), 503
+    
+    return jsonify(key=storage_key, url=presigned["url"], fields=presigned["fields"])
+
+
+@videos.route("/upload_video/complete", methods=['POST'])
+@login_required
+def complete_video_upload():
+    """
+    Create the Video record once a direct-to-S3 upload has finished.
+    
+    Returns:
+        JSON with the URL to redirect to; 400 if the form is invalid or
+        the object is missing from S3
+    """
+    if current_user.uploadsvideo == 0:
+        abort(403)
+    
+    form = CompleteVideoUploadForm()
+    if not form.validate_on_submit():
+        return jsonify(error="Invalid upload details."), 400
+    
+    # Only keys issued to this user by sign_video_upload() are accepted
+    storage_key = form.storage_key.data
+    if not storage_key.startswith(f"uploads/{current_user.id}/"):
+        abort(403)
+    
+    try:
+        playback_url = build_video_url(confirm_video_upload(storage_key))
+    except UploadError:
+        current_app.logger.exception("Direct video upload missing for user %s", current_user.id)
+        return jsonify(error="Video upload failed. Please try again later."), 400
+    
+    _save_video(form, playback_url)
+    return jsonify(redirect=url_for('main.about'))
 
 
 # ============================================================================
 # Edit Routes (Educators)
 # ============================================================================
 
-@videos.route("/revise_video/<v_id>", methods=['GET', 'POST'])
+@videos.route("/revise_video/<int:v_id>", methods=['GET', 'POST'])
 @login_required
 def revise_video(v_id):
     """
@@ -224,6 +404,10 @@ def revise_video(v_id):
         - Description
         - Remedial flag
     
+    Authorization:
+        - Video author can revise their own videos
+        - User with ID 1 (admin) can revise any video
+    
     Note: Video file itself cannot be changed (would require new upload).
     """
     # Authorization check
@@ -231,21 +415,27 @@ def revise_video(v_id):
         flash('account not authorized for video editing', 'info')
         return redirect(url_for('users.account'))
     
-    form = PostVideoForm()
+    # One identity-mapped load serves both the GET and the POST branch
+    video = Video.query.get_or_404(v_id)
+    
+    # Only the author or admin (user ID 1) can revise, as with delete_video
+    if video.author != current_user and current_user.id != 1:
+        abort(403)
+    
+    form = ReviseVideoForm()
     if form.validate_on_submit():
-        revision = Video.query.filter_by(id=v_id).first()
-        revision.title = form.title.data
-        revision.description = form.description.data
-        revision.is_remedial = form.is_remedial.data
+        video.title = form.title.data
+        video.description = form.description.data
+        video.is_remedial = form.is_remedial.data
         db.session.commit()
         flash('Video Revision Submitted', 'success')
         return render_template('about.html')
     
-    # Pre-populate form with existing video data
-    video = Video.query.get_or_404(v_id)
-    form.title.data = video.title
-    form.description.data = video.description
-    form.is_remedial.data = video.is_remedial
+    elif request.method == 'GET':
+        # Pre-populate form with existing video data
+        form.title.data = video.title
+        form.description.data = video.description
+        form.is_remedial.data = video.is_remedial
     return render_template('revise_video.html', form=form, video=video)
 
 
@@ -271,10 +461,12 @@ def delete_video(video_id):
     if video.author != current_user and current_user.id != 1:
         abort(403)
     
-    # Delete all associated questions first (cascade delete)
-    questions = Question.query.filter_by(associated_video=video).order_by(Question.pose_time)
-    for question in questions:
-        db.session.delete(question)
+    # Delete all associated questions and their answers first, one bulk
+    # DELETE per table instead of one per row
+    question_ids = select(Question.id).where(Question.video_id == video.id)
+    QuestionAnswer.query.filter(QuestionAnswer.question_id.in_(question_ids))\
+        .delete(synchronize_session=False)
+    Question.query.filter_by(video_id=video.id).delete(synchronize_session=False)
     
     # Delete video
     db.session.delete(video)
@@ -295,9 +487,10 @@ def allvideos():
     Show every video to support selecting one for question editing.
     
     Used by educators to select a video when creating/editing questions.
-    All videos are shown regardless of remedial flag.
+    All videos are shown regardless of remedial flag, 50 per page.
     """
-    videos = Video.query.all()
+    page = request.args.get('page', 1, type=int)
+    videos = Video.query.options(_LIST_COLUMNS).order_by(Video.id).paginate(page=page, per_page=50)
     return render_template('allvideos.html', title='Add/Edit Questions', videos=videos)
 
 
@@ -305,10 +498,10 @@ def allvideos():
 @login_required
 def course_video():
     """
-    Paginate through all videos with their questions for admins.
+    Paginate through all videos for admins.
     
-    Administrative dashboard showing all videos and their associated questions.
-    Used for content management and review.
+    Administrative dashboard showing all videos, linking to each video's
+    question editor. Used for content management and review.
     
     Authorization:
         - Requires uploadsvideo flag (educator/admin access)
@@ -319,6 +512,6 @@ def course_video():
         return redirect(url_for('users.account'))
     
     page = request.args.get('page', 1, type=int)
-    videos = Video.query.order_by(Video.id).paginate(page=page, per_page=3)
-    questions = Question.query.order_by(Question.video_id).order_by(Question.pose_time)
-    return render_template('course_video.html', videos=videos, questions=questions)
+    videos = Video.query.options(load_only(Video.id, Video.title, Video.video_file))\
+        .order_by(Video.id).paginate(page=page, per_page=3)
+    return render_template('course_video.html', videos=videos)
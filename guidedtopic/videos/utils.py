@@ -1,8 +1,7 @@
+from functools import lru_cache
 from pathlib import Path
-from typing import BinaryIO, Dict, Optional
+from typing import Any, BinaryIO, Dict, Optional
 
-import boto3
-from botocore.exceptions import BotoCoreError, ClientError
 from flask import current_app
 
 
@@ -10,33 +9,111 @@ class UploadError(RuntimeError):
     """Raised when a video upload fails."""
 
 
+# Multipart part size (and the size above which uploads go multipart)
+MULTIPART_CHUNK_SIZE = 8 * 1024 * 1024
+
+
+@lru_cache(maxsize=4)
+def _s3_client_for_region(region: Optional[str], max_pool_connections: int):
+    """Build an S3 client once per region and pool size; boto3 clients are thread-safe."""
+    # boto3 is imported here rather than at module level so that building the
+    # app (and the videos blueprint) does not pay for loading the AWS SDK.
+    import boto3
+    from botocore.config import Config
+
+    return boto3.client(
+        "s3",
+        region_name=region,
+        config=Config(
+            max_pool_connections=max_pool_connections,
+            retries={"max_attempts": 3, "mode": "adaptive"},
+        ),
+    )
+
+
 def _get_s3_client():
-    """Instantiate an S3 client using any configured region override."""
-    region = current_app.config.get("AWS_REGION")
-    return boto3.client("s3", region_name=region)
+    """Return the shared S3 client for any configured region override."""
+    # Every concurrent multipart part needs its own pooled connection
+    pool_size = max(10, current_app.config.get("S3_UPLOAD_CONCURRENCY", 8))
+    return _s3_client_for_region(current_app.config.get("AWS_REGION"), pool_size)
 
 
-def upload_video_to_s3(file_obj: BinaryIO, key: str, content_type: Optional[str] = None) -> Dict[str, Optional[str]]:
+def _transfer_config():
+    """Build the multipart settings for uploads from the app config."""
+    from boto3.s3.transfer import TransferConfig
+
+    return TransferConfig(
+        multipart_threshold=MULTIPART_CHUNK_SIZE,
+        multipart_chunksize=MULTIPART_CHUNK_SIZE,
+        max_concurrency=current_app.config.get("S3_UPLOAD_CONCURRENCY", 8),
+        use_threads=True,
+    )
+
+
+def _bucket() -> str:
+    """Return the configured upload bucket or raise UploadError."""
     bucket = current_app.config.get("AWS_S3_BUCKET")
     if not bucket:
         raise UploadError("AWS_S3_BUCKET is not configured.")
+    return bucket
+
+
+def _s3_metadata(client, bucket: str, key: str) -> Dict[str, Optional[str]]:
+    return {
+        "bucket": bucket,
+        "key": key,
+        "region": client.meta.region_name or current_app.config.get("AWS_REGION"),
+    }
+
+
+def upload_video_to_s3(file_obj: BinaryIO, key: str, content_type: Optional[str] = None) -> Dict[str, Optional[str]]:
+    bucket = _bucket()
+
+    from botocore.exceptions import BotoCoreError, ClientError
 
     client = _get_s3_client()
     extra_args = {"ContentType": content_type} if content_type else None
 
     try:
-        if extra_args:
-            client.upload_fileobj(file_obj, bucket, key, ExtraArgs=extra_args)
-        else:
-            client.upload_fileobj(file_obj, bucket, key)
+        client.upload_fileobj(file_obj, bucket, key, ExtraArgs=extra_args, Config=_transfer_config())
     except (BotoCoreError, ClientError) as exc:
         raise UploadError("Failed to upload video to S3") from exc
 
-    return {
-        "bucket": bucket,
-        "key": key,
-        "region": client.meta.region_name or current_app.config.get("AWS_REGION"),
-    }
+    return _s3_metadata(client, bucket, key)
+
+
+def presign_video_upload(key: str, content_type: str, max_bytes: int, expires_in: int = 900) -> Dict[str, Any]:
+    """Sign a browser POST that uploads ``key`` straight to S3, skipping this server."""
+    bucket = _bucket()
+
+    from botocore.exceptions import BotoCoreError, ClientError
+
+    client = _get_s3_client()
+    try:
+        return client.generate_presigned_post(
+            Bucket=bucket,
+            Key=key,
+            Fields={"Content-Type": content_type},
+            Conditions=[{"Content-Type": content_type}, ["content-length-range", 1, max_bytes]],
+            ExpiresIn=expires_in,
+        )
+    except (BotoCoreError, ClientError) as exc:
+        raise UploadError("Failed to sign video upload") from exc
+
+
+def confirm_video_upload(key: str) -> Dict[str, Optional[str]]:
+    """Check that a presigned upload of ``key`` landed and describe it like upload_video_to_s3()."""
+    bucket = _bucket()
+
+    from botocore.exceptions import BotoCoreError, ClientError
+
+    client = _get_s3_client()
+    try:
+        client.head_object(Bucket=bucket, Key=key)
+    except (BotoCoreError, ClientError) as exc:
+        raise UploadError("Uploaded video not found in S3") from exc
+
+    return _s3_metadata(client, bucket, key)
 
 
 def build_video_url(s3_metadata: Dict[str, Optional[str]]) -> str:
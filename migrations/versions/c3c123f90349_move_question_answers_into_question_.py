@@ -0,0 +1,86 @@
+"""Move question answers into question_answer table
+
+Revision ID: c3c123f90349
+Revises: 1845c781ce0b
+Create Date: 2026-10-14 12:07:39.060704
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3c123f90349'
+down_revision = '1845c781ce0b'
+branch_labels = None
+depends_on = None
+
+
+ANSWER_LABELS = 'ABCDE'
+
+question = sa.table(
+    'question',
+    sa.column('id', sa.Integer),
+    *[sa.column(f'content{label}', sa.Text) for label in ANSWER_LABELS],
+    *[sa.column(f'targetvid{label}', sa.Integer) for label in ANSWER_LABELS],
+)
+question_answer = sa.table(
+    'question_answer',
+    sa.column('question_id', sa.Integer),
+    sa.column('position', sa.SmallInteger),
+    sa.column('content', sa.Text),
+    sa.column('target_vid', sa.Integer),
+)
+
+
+def upgrade():
+    op.create_table('question_answer',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('question_id', sa.Integer(), nullable=False),
+    sa.Column('position', sa.SmallInteger(), nullable=False),
+    sa.Column('content', sa.Text(), nullable=True),
+    sa.Column('target_vid', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['question_id'], ['question.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('question_id', 'position', name='uq_question_answer_position')
+    )
+
+    # Copy each non-empty answer column pair into its own row
+    for position, label in enumerate(ANSWER_LABELS):
+        content = question.c[f'content{label}']
+        target_vid = question.c[f'targetvid{label}']
+        op.execute(
+            question_answer.insert().from_select(
+                ['question_id', 'position', 'content', 'target_vid'],
+                sa.select(question.c.id, sa.literal(position), content, target_vid)
+                .where(content.isnot(None))
+                .where(content != ''),
+            )
+        )
+
+    with op.batch_alter_table('question', schema=None) as batch_op:
+        for label in ANSWER_LABELS:
+            batch_op.drop_column(f'content{label}')
+            batch_op.drop_column(f'targetvid{label}')
+
+
+def downgrade():
+    with op.batch_alter_table('question', schema=None) as batch_op:
+        for label in ANSWER_LABELS:
+            batch_op.add_column(sa.Column(f'content{label}', sa.TEXT(), nullable=True))
+            batch_op.add_column(sa.Column(f'targetvid{label}', sa.INTEGER(), nullable=True))
+
+    # Copy answer rows back into the per-letter columns
+    for position, label in enumerate(ANSWER_LABELS):
+        match = sa.and_(
+            question_answer.c.question_id == question.c.id,
+            question_answer.c.position == position,
+        )
+        op.execute(
+            question.update().values({
+                f'content{label}': sa.select(question_answer.c.content).where(match).scalar_subquery(),
+                f'targetvid{label}': sa.select(question_answer.c.target_vid).where(match).scalar_subquery(),
+            })
+        )
+
+    op.drop_table('question_answer')
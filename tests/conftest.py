@@ -0,0 +1,61 @@
+"""Shared pytest fixtures."""
+
+import pytest
+
+from guidedtopic import _cached_create_app, reset_app_state
+from guidedtopic.config import Config
+from guidedtopic.extensions import db
+from guidedtopic.models import User
+
+
+class TestConfig(Config):
+    """Configuration used by the test suite."""
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    SECRET_KEY = 'test-secret-key'
+    WTF_CSRF_ENABLED = False
+    BCRYPT_LOG_ROUNDS = 4  # Minimum bcrypt cost keeps password tests fast
+
+
+@pytest.fixture(scope="session")
+def app():
+    """Create the application once for the whole test session."""
+    app = _cached_create_app(TestConfig)
+    with app.app_context():
+        db.create_all()
+    yield app
+    with app.app_context():
+        db.drop_all()
+
+
+@pytest.fixture(autouse=True)
+def _app_context(app):
+    """Give each test its own app context and reset state afterwards."""
+    with app.app_context():
+        yield
+    reset_app_state(app)
+
+
+@pytest.fixture
+def client(app):
+    """Create test client."""
+    return app.test_client()
+
+
+@pytest.fixture
+def educator(app):
+    """Create a user with video upload (educator) permissions."""
+    user = User(username='educator', email='educator@example.com',
+                password='hashed', uploadsvideo=True)
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+@pytest.fixture
+def educator_client(client, educator):
+    """Create a test client logged in as the educator."""
+    with client.session_transaction() as session:
+        session['_user_id'] = str(educator.id)
+        session['_fresh'] = True
+    return client
@@ -0,0 +1,51 @@
+"""Tests for the custom error pages."""
+
+from werkzeug.exceptions import Forbidden, InternalServerError
+
+from guidedtopic.errors.handlers import render_error
+
+
+class TestErrorHandlers:
+    """Test that status codes render their matching templates."""
+
+    def test_not_found_page(self, client):
+        """Test that unknown routes render the 404 page."""
+        response = client.get('/no-such-page')
+        assert response.status_code == 404
+        assert b'Page Not Found' in response.data
+
+    def test_forbidden_route_renders_403_page(self, educator_client):
+        """Test that abort(403) in a view renders the 403 page."""
+        response = educator_client.post('/upload_video/complete', data={
+            'storage_key': 'uploads/999/other.mp4',
+            'title': 'Not mine',
+        })
+        assert response.status_code == 403
+        assert b'Permission Denied' in response.data
+
+    def test_forbidden_page(self, app):
+        """Test that a 403 goes through render_error to the 403 template."""
+        with app.test_request_context('/'):
+            body, code = render_error(Forbidden())
+        assert code == 403
+        assert 'Permission Denied' in body
+
+    def test_server_error_page(self, app):
+        """Test that a 500 renders the generic error template."""
+        with app.test_request_context('/'):
+            body, code = render_error(InternalServerError())
+        assert code == 500
+        assert 'Something Went Wrong' in body
+
+    def test_unhandled_exception_falls_back_to_500(self, app):
+        """Test that errors without an HTTP code are reported as 500."""
+        with app.test_request_context('/'):
+            body, code = render_error(RuntimeError('boom'))
+        assert code == 500
+        assert 'Something Went Wrong' in body
+
+    def test_handlers_registered_for_each_code(self, app):
+        """Test that the blueprint routes 403, 404 and 500 to render_error."""
+        for code in (403, 404, 500):
+            handlers = app.error_handler_spec[None][code]
+            assert render_error in handlers.values()
@@ -0,0 +1,82 @@
+"""Tests for the feedback widget endpoint."""
+
+import io
+import json
+
+from werkzeug.test import EnvironBuilder, run_wsgi_app
+
+from guidedtopic.models import Feedback
+
+
+class TestFeedback:
+    """Test feedback submission handling."""
+    
+    def test_valid_feedback_is_stored(self, app, client):
+        """Test that a well-formed payload creates a Feedback row."""
+        response = client.post('/feedback', json=[{'selectedType': 'Bug'}, {'content': 'Broken'}])
+        
+        assert response.status_code == 200
+        with app.app_context():
+            feedback = Feedback.query.one()
+            assert feedback.feedback_type == 'Bug'
+            assert feedback.content == 'Broken'
+            assert feedback.date_posted is not None
+    
+    def test_malformed_feedback_rejected(self, client):
+        """Test that payloads of the wrong shape return 400."""
+        assert client.post('/feedback', json={'content': 'x'}).status_code == 400
+        assert client.post('/feedback', json=[{'selectedType': 'Bug'}]).status_code == 400
+        assert client.post('/feedback', json=[{'selectedType': 'Bug'}, {'content': ''}]).status_code == 400
+    
+    def test_non_json_content_type_rejected(self, client):
+        """Test that a text/plain body, which a cross-site form can send, returns 415."""
+        response = client.post('/feedback', data='[{"selectedType": "Bug"}, {"content": "Spam"}]',
+                               content_type='text/plain')
+        
+        assert response.status_code == 415
+        assert Feedback.query.count() == 0
+    
+    def test_non_string_values_rejected(self, client):
+        """Test that list, dict or number values return 400 instead of reaching the insert."""
+        assert client.post('/feedback', json=[{'selectedType': ['x']}, {'content': 'hi'}]).status_code == 400
+        assert client.post('/feedback', json=[{'selectedType': 'Bug'}, {'content': {'a': 1}}]).status_code == 400
+        assert client.post('/feedback', json=[{'selectedType': 7}, {'content': 'hi'}]).status_code == 400
+    
+    def test_overlong_values_rejected(self, client):
+        """Test that values longer than the per-field limits return 400."""
+        payload = [{'selectedType': 'x' * 33}, {'content': 'hi'}]
+        assert client.post('/feedback', json=payload).status_code == 400
+        payload = [{'selectedType': 'Bug'}, {'content': 'x' * 5001}]
+        assert client.post('/feedback', json=payload).status_code == 400
+    
+    def test_body_without_content_length_accepted(self, app):
+        """Test that a chunked body with no Content-Length is read, not refused."""
+        environ = EnvironBuilder(
+            path='/feedback', method='POST', content_type='application/json',
+            input_stream=io.BytesIO(b'[{"selectedType": "Bug"}, {"content": "Streamed"}]'),
+        ).get_environ()
+        del environ['CONTENT_LENGTH']
+        environ['wsgi.input_terminated'] = True  # Server has de-chunked the body
+        
+        _, status, _ = run_wsgi_app(app, environ, buffered=True)
+        
+        assert status == '200 OK'
+        assert Feedback.query.one().content == 'Streamed'
+    
+    def test_chunked_oversized_feedback_rejected(self, app):
+        """Test that a body with no Content-Length is still capped at the size limit."""
+        payload = json.dumps([{'selectedType': 'Bug'}, {'content': 'x' * 20000}]).encode()
+        environ = EnvironBuilder(
+            path='/feedback', method='POST', content_type='application/json',
+            input_stream=io.BytesIO(payload),
+        ).get_environ()
+        del environ['CONTENT_LENGTH']
+        environ['wsgi.input_terminated'] = True
+        
+        _, status, _ = run_wsgi_app(app, environ, buffered=True)
+        assert status.startswith('413')
+    
+    def test_oversized_feedback_rejected(self, client):
+        """Test that payloads over the size cap return 413."""
+        payload = [{'selectedType': 'Bug'}, {'content': 'x' * 20000}]
+        assert client.post('/feedback', json=payload).status_code == 413
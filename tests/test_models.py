@@ -0,0 +1,29 @@
+"""Tests for model helpers."""
+
+from guidedtopic.extensions import db
+from guidedtopic.models import User
+
+
+class TestPasswordResetToken:
+    """Test password reset token generation and verification."""
+    
+    def test_token_round_trip(self, app):
+        """Test that a generated token resolves back to its user."""
+        with app.app_context():
+            user = User(username='resetuser', email='reset@example.com', password='hashed')
+            db.session.add(user)
+            db.session.commit()
+            
+            token = user.get_reset_token()
+            
+            assert User.verify_reset_token(token).id == user.id
+    
+    def test_invalid_token(self, app):
+        """Test that a tampered token is rejected."""
+        with app.app_context():
+            assert User.verify_reset_token('not-a-token') is None
+    
+    def test_oversized_token(self, app):
+        """Test that overly long tokens are rejected outright."""
+        with app.app_context():
+            assert User.verify_reset_token('a' * 1000) is None
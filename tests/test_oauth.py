@@ -1,30 +1,12 @@
 """Tests for OAuth authentication functionality."""
 
-import pytest
-from guidedtopic import create_app
+from sqlalchemy.exc import IntegrityError
+
 from guidedtopic.extensions import db
 from guidedtopic.models import User
-from guidedtopic.users.oauth import _find_or_create_oauth_user
-
-
-@pytest.fixture
-def app():
-    """Create application for testing."""
-    app = create_app()
-    app.config['TESTING'] = True
-    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
-    app.config['SECRET_KEY'] = 'test-secret-key'
-    
-    with app.app_context():
-        db.create_all()
-        yield app
-        db.drop_all()
-
-
-@pytest.fixture
-def client(app):
-    """Create test client."""
-    return app.test_client()
+from guidedtopic.users import oauth as oauth_module
+from guidedtopic.users.oauth import (_find_or_create_oauth_user, _get_azure_user_info,
+                                     _get_google_user_info)
 
 
 class TestOAuthUserCreation:
@@ -203,3 +185,119 @@ class TestUserModelOAuthMethods:
             )
             assert password_user.has_oauth() is False
 
+
+
+class TestOAuthRoutes:
+    """Test OAuth login routes."""
+    
+    def test_unconfigured_provider_redirects_to_login(self, client):
+        """Test that a provider without credentials sends users back to login."""
+        response = client.get('/auth/google')
+        
+        assert response.status_code == 302
+        assert '/login' in response.headers['Location']
+
+
+class TestOAuthUsernameSuffix:
+    """Test username suffixing against existing collisions."""
+    
+    def test_skips_taken_suffixes(self, app):
+        """Test that already-used suffixed usernames are skipped."""
+        with app.app_context():
+            for i, name in enumerate(['samename', 'samename1', 'samename2']):
+                db.session.add(User(username=name, email=f'taken{i}@example.com', password='hashed'))
+            db.session.commit()
+            
+            user = _find_or_create_oauth_user('google', {
+                'id': 'google-suffix',
+                'email': 'new@example.com',
+                'name': 'samename',
+            })
+            
+            assert user.username == 'samename3'
+    
+    def test_long_name_suffix_stays_within_limit(self, app):
+        """Test that suffixes on 20-character names keep the length limit."""
+        with app.app_context():
+            db.session.add(User(username='a' * 20, email='long@example.com', password='hashed'))
+            db.session.commit()
+            
+            user = _find_or_create_oauth_user('google', {
+                'id': 'google-long',
+                'email': 'long2@example.com',
+                'name': 'a' * 25,
+            })
+            
+            assert user.username == 'a' * 19 + '1'
+    
+    def test_retries_after_concurrent_signup(self, app, monkeypatch):
+        """Test that an insert race falls back to the row the other request created."""
+        original = oauth_module._resolve_oauth_user
+        calls = []
+        
+        def racing_resolve(provider, user_info):
+            calls.append(provider)
+            if len(calls) == 1:
+                # Another request signs the same person up first
+                db.session.add(User(username='racer', email=user_info['email'], password='hashed'))
+                db.session.commit()
+                raise IntegrityError('INSERT INTO user', {}, Exception('UNIQUE constraint failed'))
+            return original(provider, user_info)
+        
+        monkeypatch.setattr(oauth_module, '_resolve_oauth_user', racing_resolve)
+        
+        with app.app_context():
+            user = _find_or_create_oauth_user('google', {
+                'id': 'google-race',
+                'email': 'race@example.com',
+                'name': 'Racer',
+            })
+            
+            assert len(calls) == 2
+            assert user.username == 'racer'
+            assert user.oauth_id == 'google-race'
+
+
+class TestOAuthUserInfoClaims:
+    """Test reading user info from validated ID token claims."""
+    
+    def test_google_claims_skip_userinfo_call(self, app):
+        """Test that Google user info comes from the ID token when complete."""
+        token = {'userinfo': {
+            'sub': '1234',
+            'email': 'g@example.com',
+            'email_verified': True,
+            'name': 'Gee',
+            'hd': 'example.com',
+        }}
+        
+        user_info = _get_google_user_info('google', token)
+        
+        assert user_info['id'] == '1234'
+        assert user_info['email'] == 'g@example.com'
+        assert user_info['name'] == 'Gee'
+        assert user_info['verified_email'] is True
+        assert user_info['hd'] == 'example.com'
+    
+    def test_google_name_falls_back_to_email(self, app):
+        """Test that a missing name claim falls back to the email local part."""
+        token = {'userinfo': {'sub': '1234', 'email': 'nameless@example.com'}}
+        
+        assert _get_google_user_info('google', token)['name'] == 'nameless'
+    
+    def test_azure_claims_skip_graph_call(self, app, monkeypatch):
+        """Test that Entra ID user info and tenant come from the ID token."""
+        monkeypatch.setitem(app.config, 'AZURE_AD_TENANT_ID', 'common')
+        token = {'userinfo': {
+            'oid': 'object-id',
+            'email': 'a@example.com',
+            'name': 'Ay',
+            'tid': 'tenant-id',
+        }}
+        
+        user_info = _get_azure_user_info('azure', token)
+        
+        assert user_info['id'] == 'object-id'
+        assert user_info['email'] == 'a@example.com'
+        assert user_info['name'] == 'Ay'
+        assert user_info['tenant_id'] == 'tenant-id'
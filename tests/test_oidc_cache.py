@@ -0,0 +1,83 @@
+"""Tests for the OIDC discovery document cache."""
+
+import json
+import os
+import threading
+import time
+
+from guidedtopic import oidc_cache
+
+
+class TestLoadDiscoveryDocument:
+    """Test stale-while-revalidate loading of discovery documents."""
+    
+    def test_fetches_and_writes_when_uncached(self, tmp_path, monkeypatch):
+        """Test that a missing cache file triggers a fetch and is written."""
+        path = tmp_path / 'google.json'
+        monkeypatch.setattr(oidc_cache, '_fetch', lambda url: {'issuer': 'fetched'})
+        
+        metadata = oidc_cache.load_discovery_document('https://example.com', path, 60)
+        
+        assert metadata == {'issuer': 'fetched'}
+        assert json.loads(path.read_text()) == {'issuer': 'fetched'}
+    
+    def test_fresh_cache_skips_network(self, tmp_path, monkeypatch):
+        """Test that a fresh cache file is served without fetching."""
+        path = tmp_path / 'google.json'
+        path.write_text(json.dumps({'issuer': 'cached'}))
+        
+        def fail(url):
+            raise AssertionError('should not fetch')
+        monkeypatch.setattr(oidc_cache, '_fetch', fail)
+        
+        metadata = oidc_cache.load_discovery_document('https://example.com', path, 60)
+        
+        assert metadata == {'issuer': 'cached'}
+    
+    def test_stale_cache_served_while_refreshing(self, tmp_path, monkeypatch):
+        """Test that a stale cache file is returned and refreshed in the background."""
+        path = tmp_path / 'google.json'
+        path.write_text(json.dumps({'issuer': 'stale'}))
+        old = time.time() - 3600
+        os.utime(path, (old, old))
+        
+        refreshed = []
+        done = threading.Event()
+        
+        def fake_refresh(url, p):
+            refreshed.append((p, threading.current_thread()))
+            done.set()
+        monkeypatch.setattr(oidc_cache, '_refresh', fake_refresh)
+        
+        metadata = oidc_cache.load_discovery_document('https://example.com', path, 60)
+        
+        assert metadata == {'issuer': 'stale'}
+        assert done.wait(timeout=5), 'background refresh did not run'
+        [(refreshed_path, refresh_thread)] = refreshed
+        assert refreshed_path == path
+        assert refresh_thread is not threading.current_thread()
+
+
+class TestPooledOAuth2Session:
+    """Test connection reuse across authlib sessions."""
+    
+    def test_sessions_share_https_adapter(self):
+        """Test that separate sessions send HTTPS through the same adapter."""
+        first = oidc_cache.PooledOAuth2Session('client-id')
+        second = oidc_cache.PooledOAuth2Session('client-id')
+        
+        assert first.get_adapter('https://example.com') is second.get_adapter('https://example.com')
+    
+    def test_close_keeps_shared_pool(self, monkeypatch):
+        """Test that closing a session does not close the shared adapter."""
+        closed = []
+        monkeypatch.setattr(oidc_cache._shared_adapter, 'close', lambda: closed.append(True))
+        
+        with oidc_cache.PooledOAuth2Session('client-id'):
+            pass
+        
+        assert closed == []
+    
+    def test_registry_uses_pooled_session(self):
+        """Test that registered OAuth 2.0 clients build pooled sessions."""
+        assert oidc_cache.CachedMetadataOAuth2App.client_cls is oidc_cache.PooledOAuth2Session
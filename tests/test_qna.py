@@ -0,0 +1,234 @@
+"""Tests for question authoring and answer storage."""
+
+import pytest
+from sqlalchemy import event
+
+from guidedtopic.extensions import db
+from guidedtopic.models import Question, QuestionAnswer, Video
+from guidedtopic.qna import routes as qna_routes
+from guidedtopic.qna.routes import (_format_seconds_to_time_string, _parse_time_string_to_seconds,
+                                    _video_choices)
+from guidedtopic.videos.routes import VIEW_DEDUPE_SECONDS
+
+
+def _make_video(educator, title='Lesson'):
+    video = Video(title=title, author=educator, video_file='https://example.com/v.m3u8')
+    db.session.add(video)
+    db.session.commit()
+    return video
+
+
+class TestQuestionAnswers:
+    """Test the Question/QuestionAnswer relationship."""
+    
+    def test_set_answers_skips_empty_choices(self, app, educator):
+        """Test that only answers with content are stored, keeping positions."""
+        video = _make_video(educator)
+        question = Question(content='Pick one', pose_time=10, video_id=video.id)
+        question.set_answers([('Yes', 0), ('', 0), ('No', video.id), (None, 0), ('', 0)])
+        db.session.add(question)
+        db.session.commit()
+        
+        assert [(a.label, a.content, a.target_vid) for a in question.answers] == [
+            ('A', 'Yes', 0),
+            ('C', 'No', video.id),
+        ]
+    
+    def test_set_answers_updates_in_place(self, app, educator):
+        """Test that re-setting answers updates rows and removes dropped ones."""
+        video = _make_video(educator)
+        question = Question(content='Pick one', pose_time=10, video_id=video.id)
+        question.set_answers([('Yes', 0), ('No', 0)])
+        db.session.add(question)
+        db.session.commit()
+        first_id = question.answers[0].id
+        
+        question.set_answers([('Absolutely', video.id), ('', 0)])
+        db.session.commit()
+        
+        assert [a.content for a in question.answers] == ['Absolutely']
+        assert question.answers[0].id == first_id
+        assert QuestionAnswer.query.count() == 1
+
+
+class TestQuestionEditor:
+    """Test the question editor routes."""
+    
+    def test_create_question(self, app, educator, educator_client):
+        """Test that submitting the editor stores the question and its answers."""
+        video = _make_video(educator)
+        
+        response = educator_client.post(f'/question_editor/{video.id}', data={
+            'question': 'What is 2 + 2?',
+            'pose_time': '00:01:05',
+            'answer1': '4', 'answer1_target': '0',
+            'answer2': '5', 'answer2_target': str(video.id),
+        })
+        
+        assert response.status_code == 200
+        question = Question.query.one()
+        assert question.pose_time == 65
+        assert [(a.label, a.content) for a in question.answers] == [('A', '4'), ('B', '5')]
+    
+    def test_revise_question_prefills_answers(self, app, educator, educator_client):
+        """Test that the revise form is populated from stored answers."""
+        video = _make_video(educator)
+        question = Question(content='Pick one', pose_time=10, video_id=video.id)
+        question.set_answers([('Yes', 0), ('No', 0)])
+        db.session.add(question)
+        db.session.commit()
+        
+        response = educator_client.get(f'/revise_question/{question.id}')
+        
+        assert response.status_code == 200
+        assert b'Yes' in response.data
+        assert b'00:00:10' in response.data
+    
+    def test_revise_question_redirects_to_course_video(self, app, educator, educator_client):
+        """Test that a successful revision saves and redirects to the admin list."""
+        video = _make_video(educator)
+        question = Question(content='Pick one', pose_time=10, video_id=video.id)
+        question.set_answers([('Yes', 0), ('No', 0)])
+        db.session.add(question)
+        db.session.commit()
+        
+        response = educator_client.post(f'/revise_question/{question.id}?page=2', data={
+            'question': 'Pick again',
+            'pose_time': '00:00:20',
+            'answer1': 'Yes', 'answer1_target': '0',
+            'answer2': 'No', 'answer2_target': '0',
+        })
+        
+        assert response.status_code == 302
+        assert response.headers['Location'].endswith('/course_video?page=2')
+        db.session.expire_all()
+        assert db.session.get(Question, question.id).pose_time == 20
+    
+    def test_study_video_renders_answers(self, app, educator, educator_client):
+        """Test that the learner page shows each stored answer."""
+        video = _make_video(educator)
+        question = Question(content='Pick one', pose_time=10, video_id=video.id)
+        question.set_answers([('Yes', 0), ('No', video.id)])
+        db.session.add(question)
+        db.session.commit()
+        
+        response = educator_client.get(f'/study_video/{video.id}')
+        
+        assert response.status_code == 200
+        assert b'option-%d-B' % question.id in response.data
+        assert b'value="%d"' % video.id in response.data
+    
+    def test_study_video_counts_views(self, app, educator, educator_client):
+        """Test that a learner page hit increments the view counter once per session."""
+        video = _make_video(educator)
+        
+        educator_client.get(f'/study_video/{video.id}')
+        educator_client.get(f'/study_video/{video.id}')
+        
+        db.session.expire_all()
+        assert db.session.get(Video, video.id).total_views == 1
+    
+    def test_study_video_loads_each_row_once(self, app, educator, educator_client):
+        """Test that a counted view does not re-read rows expired by its commit."""
+        video = _make_video(educator)
+        for pose_time in (5, 10, 15):
+            question = Question(content='Q', pose_time=pose_time, video_id=video.id)
+            question.set_answers([('Yes', 0), ('No', 0)])
+            db.session.add(question)
+        db.session.commit()
+        video_id = video.id
+        db.session.expunge_all()
+        
+        statements = []
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+        event.listen(db.engine, 'before_cursor_execute', record)
+        try:
+            response = educator_client.get(f'/study_video/{video_id}')
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', record)
+        
+        assert response.status_code == 200
+        selects = [s for s in statements if s.lstrip().upper().startswith('SELECT')]
+        # current_user (loaded, then refreshed after the view-count commit),
+        # video, questions, answers
+        assert len(selects) == 5
+    
+    def test_study_video_unknown_video_404(self, app, educator_client):
+        """Test that studying a missing video returns 404."""
+        assert educator_client.get('/study_video/999').status_code == 404
+    
+    def test_study_video_counts_again_after_window(self, app, educator, educator_client):
+        """Test that a view outside the dedupe window is counted."""
+        video = _make_video(educator)
+        
+        educator_client.get(f'/study_video/{video.id}')
+        with educator_client.session_transaction() as session:
+            viewed_at = session['recent_views'][str(video.id)]
+            session['recent_views'] = {str(video.id): viewed_at - VIEW_DEDUPE_SECONDS}
+        educator_client.get(f'/study_video/{video.id}')
+        
+        db.session.expire_all()
+        assert db.session.get(Video, video.id).total_views == 2
+
+
+class TestVideoChoicesCache:
+    """Test caching of the answer target choices."""
+    
+    def test_choices_refresh_after_video_write(self, app, educator):
+        """Test that adding or renaming a video invalidates cached choices."""
+        first = _make_video(educator, title='First')
+        assert _video_choices() == [(first.id, 'First')]
+        
+        second = _make_video(educator, title='Second')
+        assert _video_choices() == [(first.id, 'First'), (second.id, 'Second')]
+        
+        first.title = 'Renamed'
+        db.session.commit()
+        assert _video_choices()[0] == (first.id, 'Renamed')
+    
+    def test_flush_keeps_cache_until_commit(self, app, educator):
+        """Test that a flushed but uncommitted write leaves the cached choices in place."""
+        first = _make_video(educator, title='First')
+        cached = _video_choices()
+        
+        first.title = 'Pending'
+        db.session.flush()
+        assert app.extensions[qna_routes._VIDEO_CHOICES_KEY][1] is cached
+        
+        db.session.commit()
+        assert qna_routes._VIDEO_CHOICES_KEY not in app.extensions
+    
+    def test_rollback_keeps_cache(self, app, educator):
+        """Test that a rolled-back write neither clears the cache nor leaves a flag behind."""
+        _make_video(educator, title='First')
+        cached = _video_choices()
+        
+        db.session.add(Video(title='Abandoned', author=educator))
+        db.session.flush()
+        db.session.rollback()
+        
+        assert app.extensions[qna_routes._VIDEO_CHOICES_KEY][1] is cached
+        assert qna_routes._VIDEO_CHOICES_STALE not in db.session().info
+
+
+class TestTimeStrings:
+    """Test HH:MM:SS conversion helpers."""
+    
+    def test_parse_time_string(self):
+        """Test that HH:MM:SS strings convert to seconds."""
+        assert _parse_time_string_to_seconds('00:00:00') == 0
+        assert _parse_time_string_to_seconds('01:23:45') == 5025
+        assert _parse_time_string_to_seconds('99:59:59') == 359999
+    
+    def test_parse_rejects_malformed(self):
+        """Test that malformed strings raise ValueError."""
+        for bad in ('', '1:23:45', '01-23-45', 'ab:cd:ef'):
+            with pytest.raises(ValueError):
+                _parse_time_string_to_seconds(bad)
+    
+    def test_format_seconds(self):
+        """Test that seconds convert back to zero-padded HH:MM:SS."""
+        assert _format_seconds_to_time_string(0) == '00:00:00'
+        assert _format_seconds_to_time_string(5025) == '01:23:45'
+        assert _format_seconds_to_time_string(359999) == '99:59:59'
@@ -0,0 +1,199 @@
+"""Tests for user account helpers."""
+
+import io
+
+from PIL import Image
+from werkzeug.datastructures import FileStorage
+
+from guidedtopic.extensions import bcrypt, db, mail
+from guidedtopic.models import Post, User
+from guidedtopic.users import routes as users_routes
+from guidedtopic.users import utils as users_utils
+from guidedtopic.users.utils import hash_password, save_picture, send_reset_email
+
+
+def _upload(image_format, filename):
+    buffer = io.BytesIO()
+    Image.new('RGB', (400, 300), 'red').save(buffer, format=image_format)
+    buffer.seek(0)
+    return FileStorage(stream=buffer, filename=filename)
+
+
+class TestSavePicture:
+    """Test profile picture storage."""
+    
+    def test_resizes_into_profile_pics(self, app, tmp_path, monkeypatch):
+        """Test that the picture is shrunk to fit 125x125 and written to disk."""
+        (tmp_path / 'static' / 'profile_pics').mkdir(parents=True)
+        monkeypatch.setattr(app, 'root_path', str(tmp_path))
+        
+        picture_fn = save_picture(_upload('JPEG', 'me.jpg'))
+        
+        stored = tmp_path / 'static' / 'profile_pics' / picture_fn
+        assert picture_fn.endswith('.jpg')
+        assert Image.open(stored).size == (125, 94)
+        assert list(stored.parent.iterdir()) == [stored]
+    
+    def test_extension_follows_decoded_format(self, app, tmp_path, monkeypatch):
+        """Test that the stored name ignores the extension the client sent."""
+        (tmp_path / 'static' / 'profile_pics').mkdir(parents=True)
+        monkeypatch.setattr(app, 'root_path', str(tmp_path))
+        
+        picture_fn = save_picture(_upload('PNG', 'me.jpg'))
+        
+        assert picture_fn.endswith('.png')
+        assert Image.open(tmp_path / 'static' / 'profile_pics' / picture_fn).format == 'PNG'
+    
+    def test_identical_uploads_share_a_file(self, app, tmp_path, monkeypatch):
+        """Test that re-uploading the same image reuses the stored thumbnail."""
+        (tmp_path / 'static' / 'profile_pics').mkdir(parents=True)
+        monkeypatch.setattr(app, 'root_path', str(tmp_path))
+        
+        first = save_picture(_upload('PNG', 'a.png'))
+        second = save_picture(_upload('PNG', 'b.png'))
+        
+        assert first == second
+        assert len(first) == 20  # fits User.image_file
+        assert len(list((tmp_path / 'static' / 'profile_pics').iterdir())) == 1
+
+
+class TestMailDelivery:
+    """Test background delivery of account emails."""
+    
+    def test_reset_email_sent_in_background(self, app, monkeypatch):
+        """Test that the reset email is delivered off the request thread."""
+        monkeypatch.setitem(app.config, 'MAIL_DEFAULT_SENDER', 'noreply@example.com')
+        user = User(username='mailer', email='mailer@example.com', password='hashed')
+        db.session.add(user)
+        db.session.commit()
+        
+        with mail.record_messages() as outbox, app.test_request_context():
+            send_reset_email(user).result(timeout=5)
+        
+        assert len(outbox) == 1
+        assert outbox[0].recipients == ['mailer@example.com']
+        assert '/reset_password/' in outbox[0].body
+    
+    def test_delivery_failure_is_logged(self, app, monkeypatch, caplog):
+        """Test that an SMTP error is logged instead of raised."""
+        def fail(msg):
+            raise OSError('smtp down')
+        monkeypatch.setattr(users_utils.mail, 'send', fail)
+        
+        with app.test_request_context():
+            future = users_utils._send_async(users_utils.Message('Hi', sender='noreply@example.com', recipients=['a@example.com']))
+        
+        assert future.result(timeout=5) is None
+        assert 'smtp down' in caplog.text
+
+
+class TestUserPosts:
+    """Test the per-user post listing."""
+    
+    def test_lists_only_that_users_posts(self, app, client):
+        """Test that the listing shows the user's posts and not others'."""
+        author = User(username='writer', email='writer@example.com', password='hashed')
+        other = User(username='other', email='other@example.com', password='hashed')
+        db.session.add_all([
+            Post(title='Mine', content='a', author=author),
+            Post(title='Theirs', content='b', author=other),
+        ])
+        db.session.commit()
+        
+        response = client.get('/user/writer')
+        
+        assert response.status_code == 200
+        assert b'Posts by writer' in response.data
+        assert b'Mine' in response.data
+        assert b'Theirs' not in response.data
+    
+    def test_user_without_posts(self, app, client):
+        """Test that a user with no posts still gets a profile page."""
+        db.session.add(User(username='quiet', email='quiet@example.com', password='hashed'))
+        db.session.commit()
+        
+        response = client.get('/user/quiet')
+        
+        assert response.status_code == 200
+        assert b'No posts yet' in response.data
+    
+    def test_unknown_user_404(self, app, client):
+        """Test that an unknown username returns 404."""
+        assert client.get('/user/nobody').status_code == 404
+
+
+class TestAccount:
+    """Test the account settings page."""
+    
+    def test_account_page_prefills_form(self, app, educator_client):
+        """Test that the account form renders with the user's current details."""
+        response = educator_client.get('/account')
+        
+        assert response.status_code == 200
+        assert b'value="educator"' in response.data
+        assert b'value="educator@example.com"' in response.data
+    
+    def test_account_update(self, app, educator, educator_client):
+        """Test that submitting the form updates the user."""
+        response = educator_client.post('/account', data={
+            'username': 'renamed',
+            'email': 'educator@example.com',
+        })
+        
+        assert response.status_code == 302
+        db.session.expire_all()
+        assert db.session.get(User, educator.id).username == 'renamed'
+
+
+class TestLogin:
+    """Test password login."""
+    
+    def test_unknown_email_still_checks_a_hash(self, app, client, monkeypatch):
+        """Test that an unknown email costs one bcrypt check, like a wrong password."""
+        checked = []
+        original = bcrypt.check_password_hash
+        
+        def counting_check(pw_hash, password):
+            checked.append(pw_hash)
+            return original(pw_hash, password)
+        monkeypatch.setattr(bcrypt, 'check_password_hash', counting_check)
+        
+        response = client.post('/login', data={'email': 'ghost@example.com', 'password': 'secret'})
+        
+        assert b'Login unsuccessful' in response.data
+        assert checked == [users_routes._dummy_password_hash(4)]
+    
+    def test_correct_password_logs_in(self, app, client):
+        """Test that a matching password signs the user in."""
+        hashed = hash_password('secret')
+        db.session.add(User(username='pw', email='pw@example.com', password=hashed))
+        db.session.commit()
+        
+        response = client.post('/login', data={'email': 'pw@example.com', 'password': 'secret'})
+        
+        assert response.status_code == 302
+
+
+class TestRegistration:
+    """Test account registration."""
+    
+    def test_taken_username_and_email_rejected(self, app, client):
+        """Test that existing usernames and emails fail validation."""
+        db.session.add(User(username='taken', email='taken@example.com', password='hashed'))
+        db.session.commit()
+        
+        response = client.post('/register', data={
+            'username': 'taken',
+            'email': 'taken@example.com',
+            'password': 'secret',
+            'confirm_password': 'secret',
+        })
+        
+        assert b'That username is taken' in response.data
+        assert b'That email is already registered' in response.data
+        assert User.query.count() == 1
+
+    
+    def test_password_hash_uses_configured_work_factor(self, app):
+        """Test that new hashes follow BCRYPT_LOG_ROUNDS from the app config."""
+        assert hash_password('secret').startswith('$2b$04$')
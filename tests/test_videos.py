@@ -0,0 +1,295 @@
+"""Tests for video storage helpers."""
+
+import io
+
+from sqlalchemy import event
+
+from guidedtopic.config import DEFAULT_UPLOAD_EXTENSIONS
+from guidedtopic.extensions import db
+from guidedtopic.models import Question, QuestionAnswer, User, Video
+from guidedtopic.videos import routes as video_routes
+from guidedtopic.videos import utils as video_utils
+
+
+class FakeS3Client:
+    """Records upload_fileobj calls instead of talking to S3."""
+    
+    class meta:
+        region_name = 'eu-west-1'
+    
+    def __init__(self):
+        self.uploads = []
+    
+    def upload_fileobj(self, file_obj, bucket, key, ExtraArgs=None, Config=None):
+        self.uploads.append({'bucket': bucket, 'key': key, 'extra_args': ExtraArgs, 'config': Config})
+
+
+class TestUploadVideoToS3:
+    """Test S3 upload configuration."""
+    
+    def test_upload_uses_multipart_config(self, app, monkeypatch):
+        """Test that uploads go through the configured multipart settings."""
+        client = FakeS3Client()
+        monkeypatch.setattr(video_utils, '_get_s3_client', lambda: client)
+        monkeypatch.setitem(app.config, 'AWS_S3_BUCKET', 'bucket')
+        monkeypatch.setitem(app.config, 'S3_UPLOAD_CONCURRENCY', 3)
+        
+        metadata = video_utils.upload_video_to_s3(io.BytesIO(b'data'), 'videos/a.mp4', 'video/mp4')
+        
+        upload = client.uploads[0]
+        assert upload['extra_args'] == {'ContentType': 'video/mp4'}
+        assert upload['config'].max_concurrency == 3
+        assert upload['config'].multipart_chunksize == video_utils.MULTIPART_CHUNK_SIZE
+        assert metadata == {'bucket': 'bucket', 'key': 'videos/a.mp4', 'region': 'eu-west-1'}
+    
+    def test_client_reused_per_region(self, app, monkeypatch):
+        """Test that the S3 client is built once and shared across uploads."""
+        video_utils._s3_client_for_region.cache_clear()
+        monkeypatch.setitem(app.config, 'AWS_REGION', 'us-west-2')
+        
+        assert video_utils._get_s3_client() is video_utils._get_s3_client()
+        video_utils._s3_client_for_region.cache_clear()
+    
+    def test_client_pool_covers_upload_concurrency(self, app, monkeypatch):
+        """Test that the connection pool is at least as large as the part concurrency."""
+        video_utils._s3_client_for_region.cache_clear()
+        monkeypatch.setitem(app.config, 'AWS_REGION', 'us-west-2')
+        monkeypatch.setitem(app.config, 'S3_UPLOAD_CONCURRENCY', 32)
+        
+        client = video_utils._get_s3_client()
+        
+        assert client.meta.config.max_pool_connections == 32
+        video_utils._s3_client_for_region.cache_clear()
+
+
+class TestDirectUpload:
+    """Test the presigned direct-to-S3 upload endpoints."""
+    
+    def test_sign_returns_user_scoped_key(self, app, educator, educator_client, monkeypatch):
+        """Test that signing validates the filename and scopes the key to the user."""
+        signed = []
+        
+        def fake_presign(key, content_type, max_bytes):
+            signed.append((key, content_type, max_bytes))
+            return {'url': 'https://bucket.s3.amazonaws.com/', 'fields': {'key': key}}
+        monkeypatch.setattr(video_routes, 'presign_video_upload', fake_presign)
+        
+        response = educator_client.post('/upload_video/sign', data={'filename': 'Lesson One.mp4'})
+        
+        assert response.status_code == 200
+        key, content_type, max_bytes = signed[0]
+        assert key.startswith(f'uploads/{educator.id}/') and key.endswith('.mp4')
+        assert len(key) == len(f'uploads/{educator.id}/') + 26 + len('.mp4')
+        assert content_type == 'video/mp4'
+        assert max_bytes == app.config['MAX_CONTENT_LENGTH']
+        assert response.get_json()['key'] == key
+    
+    def test_default_extensions_have_known_content_types(self, app):
+        """Test that every default upload extension maps to a video content type."""
+        assert DEFAULT_UPLOAD_EXTENSIONS <= video_routes.VIDEO_CONTENT_TYPES.keys()
+        assert video_routes.VIDEO_CONTENT_TYPES['mov'] == 'video/quicktime'
+    
+    def test_sign_rejects_unsupported_extension(self, app, educator_client):
+        """Test that signing refuses files outside the extension whitelist."""
+        response = educator_client.post('/upload_video/sign', data={'filename': 'notes.exe'})
+        
+        assert response.status_code == 400
+        assert 'Unsupported file type' in response.get_json()['error']
+    
+    def test_complete_creates_video(self, app, educator, educator_client, monkeypatch):
+        """Test that completing a confirmed upload stores the Video."""
+        key = f'uploads/{educator.id}/abc.mp4'
+        monkeypatch.setattr(video_routes, 'confirm_video_upload',
+                            lambda k: {'bucket': 'bucket', 'key': k, 'region': None})
+        
+        response = educator_client.post('/upload_video/complete', data={
+            'storage_key': key,
+            'title': 'Direct',
+        })
+        
+        assert response.status_code == 200
+        video = Video.query.filter_by(title='Direct').one()
+        assert video.video_file == f'https://bucket.s3.amazonaws.com/{key}'
+    
+    def test_complete_runs_no_queries_after_commit(self, app, educator, educator_client,
+                                                   monkeypatch):
+        """Test that saving the uploaded video is the request's last database work."""
+        monkeypatch.setattr(video_routes, 'confirm_video_upload',
+                            lambda k: {'bucket': 'bucket', 'key': k, 'region': None})
+        db.session.expunge_all()
+        
+        events = []
+        def record_statement(conn, cursor, statement, *args):
+            events.append(statement.split()[0].upper())
+        def record_commit(conn):
+            events.append('COMMIT')
+        event.listen(db.engine, 'before_cursor_execute', record_statement)
+        event.listen(db.engine, 'commit', record_commit)
+        try:
+            response = educator_client.post('/upload_video/complete', data={
+                'storage_key': f'uploads/{educator.id}/abc.mp4',
+                'title': 'Direct',
+            })
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', record_statement)
+            event.remove(db.engine, 'commit', record_commit)
+        
+        assert response.status_code == 200
+        assert events.count('COMMIT') == 1
+        assert events[-1] == 'COMMIT'
+    
+    def test_complete_rejects_other_users_key(self, app, educator_client):
+        """Test that a key outside the user's upload prefix is refused."""
+        response = educator_client.post('/upload_video/complete', data={
+            'storage_key': 'uploads/999/abc.mp4',
+            'title': 'Stolen',
+        })
+        
+        assert response.status_code == 403
+        assert Video.query.filter_by(title='Stolen').count() == 0
+    
+    def test_upload_page_enables_direct_upload(self, app, educator_client, monkeypatch):
+        """Test that the upload page wires up direct upload when configured."""
+        monkeypatch.setitem(app.config, 'S3_DIRECT_UPLOAD', True)
+        
+        response = educator_client.get('/upload_video')
+        
+        assert response.status_code == 200
+        assert b'data-sign-url="/upload_video/sign"' in response.data
+    
+    def test_upload_page_limits_file_picker(self, app, educator_client):
+        """Test that the page restricts file types and size before upload."""
+        response = educator_client.get('/upload_video')
+        
+        assert b'accept=".m4v,.mov,.mp4"' in response.data
+        assert b'data-max-bytes="%d"' % app.config['MAX_CONTENT_LENGTH'] in response.data
+    
+    def test_oversized_upload_rejected_before_parsing(self, app, educator_client, monkeypatch):
+        """Test that a body over MAX_CONTENT_LENGTH is refused with 413."""
+        monkeypatch.setitem(app.config, 'MAX_CONTENT_LENGTH', 10)
+        
+        response = educator_client.post('/upload_video', data={'title': 'Big', 'description': 'x' * 100})
+        
+        assert response.status_code == 413
+
+
+class TestDeleteVideo:
+    """Test deleting a video with its questions."""
+    
+    def test_delete_removes_questions_and_answers(self, app, educator, educator_client):
+        """Test that a video's questions and answers are deleted with it."""
+        video = Video(title='Doomed', author=educator, video_file='https://example.com/v.m3u8')
+        keep = Video(title='Kept', author=educator, video_file='https://example.com/k.m3u8')
+        db.session.add_all([video, keep])
+        db.session.commit()
+        for target in (video, keep):
+            question = Question(content='Q', pose_time=5, video_id=target.id)
+            question.set_answers([('Yes', 0), ('No', 0)])
+            db.session.add(question)
+        db.session.commit()
+        
+        response = educator_client.post(f'/video/{video.id}/delete')
+        
+        assert response.status_code == 302
+        assert Video.query.count() == 1
+        assert Question.query.one().video_id == keep.id
+        assert QuestionAnswer.query.count() == 2
+
+
+class TestVideoLists:
+    """Test the video list pages."""
+    
+    def test_select_video_lists_primary_videos(self, app, educator, educator_client):
+        """Test that the learner list shows primary videos and their descriptions."""
+        db.session.add_all([
+            Video(title='Primary', description='Start here', author=educator, is_remedial=False),
+            Video(title='Remedial', description='Try again', author=educator, is_remedial=True),
+        ])
+        db.session.commit()
+        
+        response = educator_client.get('/select_video')
+        
+        assert b'Primary' in response.data
+        assert b'Start here' in response.data
+        assert b'Remedial' not in response.data
+    
+    def test_course_video_lists_playback_urls(self, app, educator, educator_client):
+        """Test that the management page renders each video's playback URL."""
+        db.session.add(Video(title='Managed', author=educator, video_file='https://example.com/m.m3u8'))
+        db.session.commit()
+        
+        response = educator_client.get('/course_video')
+        
+        assert b'Managed' in response.data
+        assert b'https://example.com/m.m3u8' in response.data
+    
+    def test_allvideos_paginates(self, app, educator, educator_client):
+        """Test that the question-editing list shows 50 videos per page."""
+        db.session.add_all(Video(title=f'V{n:02d}', author=educator) for n in range(51))
+        db.session.commit()
+        
+        first = educator_client.get('/allvideos')
+        second = educator_client.get('/allvideos?page=2')
+        
+        assert b'V49' in first.data and b'V50' not in first.data
+        assert b'V50' in second.data
+
+
+class TestReviseVideo:
+    """Test editing video metadata."""
+    
+    def test_revise_updates_metadata(self, app, educator, educator_client):
+        """Test that submitting the revise form saves the new metadata."""
+        video = Video(title='Old', author=educator)
+        db.session.add(video)
+        db.session.commit()
+        
+        response = educator_client.post(f'/revise_video/{video.id}', data={
+            'title': 'New',
+            'description': 'Updated',
+            'is_remedial': 'y',
+        })
+        
+        assert b'Video Revision Submitted' in response.data
+        db.session.expire_all()
+        revised = db.session.get(Video, video.id)
+        assert (revised.title, revised.description, revised.is_remedial) == ('New', 'Updated', True)
+    
+    def test_revise_other_authors_video_403(self, app, educator, educator_client):
+        """Test that an educator cannot revise another educator's video."""
+        other = User(username='other', email='other@example.com', password='hashed', uploadsvideo=True)
+        video = Video(title='Theirs', author=educator)
+        db.session.add_all([other, video])
+        db.session.commit()
+        # The educator fixture is user 1 (the admin), so act as the other educator
+        with educator_client.session_transaction() as session:
+            session['_user_id'] = str(other.id)
+        
+        response = educator_client.post(f'/revise_video/{video.id}', data={'title': 'Mine now'})
+        
+        assert response.status_code == 403
+        db.session.expire_all()
+        assert db.session.get(Video, video.id).title == 'Theirs'
+    
+    def test_revise_unknown_video_404(self, app, educator_client):
+        """Test that revising a missing video returns 404 instead of erroring."""
+        assert educator_client.post('/revise_video/999', data={'title': 'X'}).status_code == 404
+    
+    def test_getvideopath_unknown_video_404(self, app, educator_client):
+        """Test that a missing video's path lookup returns 404."""
+        assert educator_client.get('/getvideopath/999').status_code == 404
+    
+    def test_getvideopath_returns_json_with_etag(self, app, educator, educator_client):
+        """Test that the path lookup returns JSON and honours If-None-Match."""
+        video = Video(title='Clip', video_file='https://cdn.example.com/clip.mp4', author=educator)
+        db.session.add(video)
+        db.session.commit()
+        
+        response = educator_client.get(f'/getvideopath/{video.id}')
+        assert response.status_code == 200
+        assert response.get_json() == {'url': 'https://cdn.example.com/clip.mp4'}
+        assert 'private' in response.headers['Cache-Control']
+        etag = response.headers['ETag']
+        
+        cached = educator_client.get(f'/getvideopath/{video.id}', headers={'If-None-Match': etag})
+        assert cached.status_code == 304